@@ -1,11 +1,26 @@
 ﻿# -*- coding: utf-8 -*-
 import sys
+import time
+
+_START_TIME = time.perf_counter()
+
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 
 from main_window import MainWindow
+from settings import init_settings
 
 if __name__ == "__main__":
+    init_settings(sys.argv[1:])
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    if "--startup-benchmark" in sys.argv:
+        # Used by startup_benchmark.py: report time-to-first-paint and exit.
+        def report_first_paint():
+            print(f"first_paint_ms={(time.perf_counter() - _START_TIME) * 1000:.1f}")
+            app.quit()
+        QTimer.singleShot(0, report_first_paint)
+    else:
+        QTimer.singleShot(0, window.start_warmup)
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import argparse
+import sys
+import time
+
+from settings import build_arg_parser, init_settings
+
+def read_queries(path):
+    # One query per line, optionally prefixed with "<priority><TAB>".
+    queries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            priority, _, query = line.partition('\t')
+            if query and priority.lstrip('-').isdigit():
+                queries.append((query.strip(), int(priority)))
+            else:
+                queries.append((line, 0))
+    return queries
+
+def main():
+    # The settings flags are declared on this parser too (as a parent), so
+    # their values are never mistaken for the queries file.
+    parser = argparse.ArgumentParser(
+        parents=[build_arg_parser()],
+        description="Run Leadz searches headlessly on the search process pool. "
+                    "Any setting can also be passed as a flag, e.g. --profile thorough --search-processes 4.")
+    parser.add_argument('queries_file', nargs='?', help="file with one query per line")
+    parser.add_argument('--query', action='append', default=[], help="a query to run (repeatable)")
+    parser.add_argument('--output', default='leadz_results.jsonl',
+                        help="output file: .jsonl, .csv or .parquet (needs pyarrow)")
+    args = parser.parse_args()
+
+    settings = init_settings(sys.argv[1:])
+
+    from results_export import open_writer
+    from search_pool import SearchPool
+
+    queries = [(q, 0) for q in args.query]
+    if args.queries_file:
+        queries += read_queries(args.queries_file)
+    if not queries:
+        parser.error("no queries given")
+
+    try:
+        output = open_writer(args.output)
+    except (ValueError, RuntimeError) as e:
+        parser.error(str(e))
+    pool = SearchPool(settings=settings)
+    pool.start()
+    start = time.perf_counter()
+    try:
+        # Workers pick up jobs as soon as they are submitted, so submit in
+        # priority order; the pool's own ordering then covers the rest.
+        queries.sort(key=lambda q: q[1], reverse=True)
+        job_queries = {pool.submit(query, priority): query for query, priority in queries}
+        finished = 0
+        while finished < len(job_queries):
+            event = pool.get_event(timeout=1.0)
+            if event is None:
+                continue
+            kind, job_id, payload = event
+            if kind == 'job':
+                output.write(payload, query=job_queries[job_id], search_id=job_id)
+            elif kind == 'finished':
+                finished += 1
+                print(f"[{finished}/{len(job_queries)}] '{job_queries[job_id]}': {payload} jobs "
+                      f"({time.perf_counter() - start:.0f} s)", file=sys.stderr)
+            elif kind == 'error':
+                print(f"ERROR: {payload}", file=sys.stderr)
+    finally:
+        pool.shutdown()
+        output.close()
+
+if __name__ == "__main__":
+    main()
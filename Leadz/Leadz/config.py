@@ -1,10 +1,55 @@
 # -*- coding: utf-8 -*-
+from pathlib import Path
 
+CONFIG_DIR = Path.home() / '.job_llama'
+
+# These are the defaults; settings.py layers a performance profile,
+# ~/.job_llama/settings.json, LEADZ_* environment variables and command-line
+# flags on top of them. Read them through settings.get_settings().
+DEFAULT_PROFILE = 'balanced' # 'fast', 'balanced' or 'thorough'
+LLM_BACKEND = 'ollama'
 LLM_MODEL = 'qwen3:8b'
+LLM_HOST = None # None uses $OLLAMA_HOST or http://localhost:11434
+LLM_KEEP_ALIVE = '30m' # how long Ollama keeps LLM_MODEL loaded after a request
 EMBEDDING_MODEL = 'all-MiniLM-L6-v2' 
 SEARCH_RESULTS_COUNT = 25
 TOP_N_PAGES_TO_ANALYZE = 8
+MINIMUM_JOBS_THRESHOLD = 3 # fewer jobs than this triggers a retry with targeted queries
+MAX_SEARCH_ATTEMPTS = 2
+SEARCH_DEADLINE = 0 # seconds per search, 0 for no limit
+SEARCH_PROCESSES = 2 # searches that can run at the same time (see search_pool.py)
 SIMILARITY_THRESHOLD = 0.40
+FETCH_CONCURRENCY = 4 # pages downloaded in parallel
+FETCH_TIMEOUT = 7 # seconds; the upper bound for hosts with a known latency
+MIN_FETCH_TIMEOUT = 2
+CIRCUIT_BREAKER_FAILURES = 3 # consecutive failures before a host is skipped
+CIRCUIT_BREAKER_COOLDOWN = 6 * 3600 # seconds; doubles each time a probe fails
+# Hosts with at least HOST_YIELD_MIN_PAGES analysed pages whose smoothed job
+# yield is below MIN_HOST_YIELD get only one URL fetched per search.
+MIN_HOST_YIELD = 0.1
+HOST_YIELD_MIN_PAGES = 10
+MAX_PAGE_BYTES = 1_000_000 # downloads are cut off after this many bytes
+MAX_PAGE_CHARS = 6000 # cleaned text kept per page, before boilerplate is stripped for the LLM
+EMBEDDING_CACHE_SIZE = 512 # page embeddings kept between searches and retries
+# Pages are scored against the user query and the LLM-generated search queries.
+# 'max' takes the best-matching query, 'weighted' blends the user query
+# (USER_QUERY_WEIGHT) with the mean of the generated ones.
+RANKING_USE_GENERATED_QUERIES = True
+RANKING_MODE = 'max'
+USER_QUERY_WEIGHT = 0.5
+# Embedding pre-filter in front of the LLM (see relevance_classifier.py). The
+# thresholds apply to cosine similarity until a model is fitted with
+# `python relevance_classifier.py`, which replaces them with calibrated values.
+RELEVANCE_CLASSIFIER_ENABLED = True
+CLASSIFIER_REJECT_BELOW = None # None uses SIMILARITY_THRESHOLD
+CLASSIFIER_ACCEPT_ABOVE = 0.65
+STREAM_EXTRACTION = True # parse extraction output as it streams and stop early on irrelevant pages
+EXTRACTION_TOKEN_BUDGET = 1000 # page text tokens sent to the LLM per page (see prompt_builder.py)
+PROMPT_CHARS_PER_TOKEN = 4 # for estimating token counts; lower it for non-English pages
+# Short pages can be analysed several at a time in one LLM call, which is
+# faster on small local models where per-call overhead dominates. 1 disables it.
+EXTRACTION_BATCH_SIZE = 1
+EXTRACTION_BATCH_TOKEN_BUDGET = 2500 # page text tokens per batched call
 
 THEMES = {
     'light': {
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+from config import CONFIG_DIR
+from settings import get_settings
+
+HOST_HEALTH_FILE = CONFIG_DIR / 'host_health.json'
+
+# Status codes job boards use to turn scrapers away (999 is LinkedIn's).
+BLOCK_STATUSES = (401, 403, 429, 451, 999)
+
+MAX_COOLDOWN = 7 * 24 * 3600
+LATENCY_SMOOTHING = 0.3
+COUNTERS = ('attempts', 'successes', 'timeouts', 'blocks', 'errors', 'pages_analyzed', 'jobs_found')
+LOCK_TIMEOUT = 10 # seconds to wait for another process to finish saving
+STALE_LOCK = 60 # a lock file older than this was left behind by a crashed process
+
+def host_of(url):
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+class _FileLock:
+    # A lock file created with O_EXCL, which behaves the same on Windows and POSIX.
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while True:
+            try:
+                os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > STALE_LOCK:
+                        os.unlink(self.path)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"{self.path} is held by another process")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+class HostHealthRegistry:
+    # Per-domain fetch statistics that persist across searches. Hosts that keep
+    # failing trip a circuit breaker and are skipped until their cooldown ends
+    # (then one probe is let through; another failure doubles the cooldown).
+    # Timeouts adapt to each host's observed latency, and hosts whose pages
+    # rarely yield jobs are fetched last and only probed (see is_low_yield).
+    # Every search process has its own registry, so save() merges the changes
+    # made since the last save into the file instead of overwriting it.
+    def __init__(self, path=HOST_HEALTH_FILE):
+        self.settings = get_settings()
+        self.path = path
+        self.hosts = {}
+        self._changes = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _file_lock(self):
+        return _FileLock(self.path.with_name(self.path.name + '.lock'))
+
+    def _read(self):
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Host health file error: {e}")
+            return {}
+
+    def _load(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._file_lock():
+                self.hosts = self._read()
+        except Exception as e:
+            print(f"Failed to load host health: {e}")
+
+    def _merge(self, hosts):
+        for host, changes in self._changes.items():
+            ours = self.hosts[host]
+            entry = hosts.get(host)
+            if entry is None:
+                hosts[host] = dict(ours)
+                continue
+            for key in COUNTERS:
+                entry[key] += changes[key]
+            if changes['latency']:
+                entry['latency'] = ours['latency']
+            if not changes['attempts']:
+                continue
+            entry['last_status'] = ours['last_status']
+            if changes['reset']:
+                # A success since the last save closes the breaker.
+                for key in ('consecutive_failures', 'open_until', 'cooldown'):
+                    entry[key] = ours[key]
+            else:
+                entry['consecutive_failures'] += changes['failures']
+                entry['open_until'] = max(entry['open_until'], ours['open_until'])
+                entry['cooldown'] = max(entry['cooldown'], ours['cooldown'])
+        return hosts
+
+    def save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._file_lock(), self._lock:
+                hosts = self._merge(self._read())
+                # Written to a temporary file and renamed, so a reader never
+                # sees a half-written file.
+                fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.host_health.')
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(hosts, f, indent=1)
+                    os.replace(temp_path, self.path)
+                except BaseException:
+                    os.unlink(temp_path)
+                    raise
+                self.hosts = hosts
+                self._changes = {}
+        except Exception as e:
+            print(f"Failed to save host health: {e}")
+
+    def _entry(self, host):
+        entry = self.hosts.get(host)
+        if entry is None:
+            entry = self.hosts[host] = {
+                'attempts': 0, 'successes': 0, 'timeouts': 0, 'blocks': 0, 'errors': 0,
+                'latency': None, 'last_status': None, 'consecutive_failures': 0,
+                'open_until': 0, 'cooldown': self.settings.circuit_breaker_cooldown,
+                'pages_analyzed': 0, 'jobs_found': 0,
+            }
+        changes = self._changes.get(host)
+        if changes is None:
+            changes = self._changes[host] = dict.fromkeys(COUNTERS, 0)
+            changes.update(latency=False, reset=False, failures=0)
+        return entry, changes
+
+    def record_success(self, url, latency, status=200):
+        with self._lock:
+            entry, changes = self._entry(host_of(url))
+            for key in ('attempts', 'successes'):
+                entry[key] += 1
+                changes[key] += 1
+            changes.update(latency=True, reset=True, failures=0)
+            entry['last_status'] = status
+            entry['consecutive_failures'] = 0
+            entry['open_until'] = 0
+            entry['cooldown'] = self.settings.circuit_breaker_cooldown
+            if entry['latency'] is None:
+                entry['latency'] = latency
+            else:
+                entry['latency'] += LATENCY_SMOOTHING * (latency - entry['latency'])
+
+    def record_failure(self, url, kind, status=None):
+        host = host_of(url)
+        with self._lock:
+            entry, changes = self._entry(host)
+            counter = {'timeout': 'timeouts', 'blocked': 'blocks'}.get(kind, 'errors')
+            for key in ('attempts', counter):
+                entry[key] += 1
+                changes[key] += 1
+            changes['failures'] += 1
+            entry['last_status'] = status
+            entry['consecutive_failures'] += 1
+
+            now = time.time()
+            half_open = entry['open_until'] and now >= entry['open_until']
+            if half_open or entry['consecutive_failures'] >= self.settings.circuit_breaker_failures:
+                if half_open:
+                    entry['cooldown'] = min(entry['cooldown'] * 2, MAX_COOLDOWN)
+                entry['open_until'] = now + entry['cooldown']
+                print(f"  Circuit breaker open for {host} ({kind}, "
+                      f"{entry['consecutive_failures']} consecutive failures)")
+
+    def record_yield(self, url, found_job):
+        with self._lock:
+            entry, changes = self._entry(host_of(url))
+            entry['pages_analyzed'] += 1
+            changes['pages_analyzed'] += 1
+            if found_job:
+                entry['jobs_found'] += 1
+                changes['jobs_found'] += 1
+
+    def is_open(self, url):
+        entry = self.hosts.get(host_of(url))
+        return bool(entry) and time.time() < entry['open_until']
+
+    def timeout_for(self, url):
+        entry = self.hosts.get(host_of(url))
+        max_timeout = self.settings.fetch_timeout
+        if not entry or entry['latency'] is None:
+            return max_timeout
+        return max(self.settings.min_fetch_timeout, min(max_timeout, entry['latency'] * 3))
+
+    def is_low_yield(self, url):
+        entry = self.hosts.get(host_of(url))
+        if not entry or entry['pages_analyzed'] < self.settings.host_yield_min_pages:
+            return False
+        yield_rate = (entry['jobs_found'] + 1) / (entry['pages_analyzed'] + 2)
+        return yield_rate < self.settings.min_host_yield
+
+    def priority(self, url):
+        entry = self.hosts.get(host_of(url))
+        if not entry:
+            return 0.5
+        # Laplace-smoothed success and job yield rates, so unknown hosts sit in
+        # the middle and a single result does not dominate.
+        success_rate = (entry['successes'] + 1) / (entry['attempts'] + 2)
+        yield_rate = (entry['jobs_found'] + 1) / (entry['pages_analyzed'] + 2)
+        return success_rate * yield_rate * 2
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_host_health_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = HostHealthRegistry()
+        return _registry
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import bisect
+from collections import defaultdict
+
+# In-memory indexes over the JobRecords of one results tab, so filtering and
+# sorting never touch the widgets or re-parse job text. Skills, company and
+# location map each distinct (lower-cased) value to the ids of the jobs that
+# have it; there are far fewer distinct values than jobs, so substring
+# matching scans the keys and unions the id sets. Annual salary maxima are
+# kept sorted for range queries, and each sort order is computed once and
+# then kept up to date by inserting new jobs in place.
+
+SORT_KEYS = {
+    'relevance': lambda job, i: (-(job.similarity or 0), i),
+    'salary': lambda job, i: (-(job.annual_salary()[1] or -1), i),
+    'title': lambda job, i: (job.title.lower(), i),
+    'company': lambda job, i: (job.company.lower(), i),
+    'newest': lambda job, i: -i,
+}
+
+def parse_salary_amount(text):
+    # "80k", "80,000", "1.2m" -> float; None for empty or invalid input.
+    text = text.strip().lower().replace(',', '').replace('$', '')
+    if not text:
+        return None
+    multiplier = {'k': 1e3, 'm': 1e6}.get(text[-1], 1)
+    if multiplier > 1:
+        text = text[:-1]
+    try:
+        return float(text) * multiplier
+    except ValueError:
+        return None
+
+class JobIndex:
+    def __init__(self):
+        self.jobs = []
+        self.skills = defaultdict(set)
+        self.companies = defaultdict(set)
+        self.locations = defaultdict(set)
+        self.job_types = defaultdict(set)
+        self.experiences = defaultdict(set)
+        self._salary_max = [] # sorted (annual maximum, id)
+        self._orders = {}
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def add(self, job):
+        job_id = len(self.jobs)
+        self.jobs.append(job)
+        for skill in job.skills:
+            self.skills[skill.lower()].add(job_id)
+        self.companies[job.company.lower()].add(job_id)
+        self.locations[job.location.lower()].add(job_id)
+        self.job_types[job.job_type].add(job_id)
+        self.experiences[job.experience].add(job_id)
+        annual_max = job.annual_salary()[1]
+        if annual_max is not None:
+            bisect.insort(self._salary_max, (annual_max, job_id))
+        for sort, (keys, order) in self._orders.items():
+            key = SORT_KEYS[sort](job, job_id)
+            position = bisect.bisect(keys, key)
+            keys.insert(position, key)
+            order.insert(position, job_id)
+        return job_id
+
+    def _matching(self, index, text):
+        text = text.strip().lower()
+        ids = set()
+        for value, value_ids in index.items():
+            if text in value:
+                ids |= value_ids
+        return ids
+
+    def query(self, skill='', company='', location='', job_type=None, experience=None,
+              min_salary=None, sort='relevance'):
+        # Returns the ids of matching jobs in sort order. Empty or None
+        # criteria do not filter.
+        candidates = []
+        if skill.strip():
+            # Several comma-separated skills must all match.
+            for part in skill.split(','):
+                if part.strip():
+                    candidates.append(self._matching(self.skills, part))
+        if company.strip():
+            candidates.append(self._matching(self.companies, company))
+        if location.strip():
+            candidates.append(self._matching(self.locations, location))
+        if job_type is not None:
+            candidates.append(self.job_types.get(job_type, set()))
+        if experience is not None:
+            candidates.append(self.experiences.get(experience, set()))
+        if min_salary is not None:
+            start = bisect.bisect_left(self._salary_max, (min_salary, -1))
+            candidates.append({job_id for _, job_id in self._salary_max[start:]})
+
+        order = self.order(sort)
+        if not candidates:
+            return order
+        candidates.sort(key=len)
+        matches = candidates[0].intersection(*candidates[1:])
+        return [job_id for job_id in order if job_id in matches]
+
+    def order(self, sort='relevance'):
+        if sort not in self._orders:
+            key = SORT_KEYS[sort]
+            pairs = sorted((key(job, i), i) for i, job in enumerate(self.jobs))
+            self._orders[sort] = ([k for k, _ in pairs], [i for _, i in pairs])
+        return self._orders[sort][1]
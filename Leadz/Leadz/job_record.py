@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+import enum
+import json
+import re
+import sqlite3
+import sys
+
+from job_schema import MISSING
+
+class JobType(enum.Enum):
+    FULL_TIME = 'Full-time'
+    PART_TIME = 'Part-time'
+    CONTRACT = 'Contract'
+    INTERNSHIP = 'Internship'
+    UNKNOWN = MISSING
+
+class Experience(enum.Enum):
+    ENTRY = 'Entry-level'
+    MID = 'Mid-level'
+    SENIOR = 'Senior'
+    UNKNOWN = MISSING
+
+JOB_TYPE_PATTERNS = (
+    (JobType.INTERNSHIP, re.compile(r'\bintern', re.IGNORECASE)),
+    (JobType.CONTRACT, re.compile(r'\b(contract|freelance|temporary|temp)\b', re.IGNORECASE)),
+    (JobType.PART_TIME, re.compile(r'\bpart[- ]?time\b', re.IGNORECASE)),
+    (JobType.FULL_TIME, re.compile(r'\b(full[- ]?time|permanent)\b', re.IGNORECASE)),
+)
+EXPERIENCE_PATTERNS = (
+    (Experience.SENIOR, re.compile(r'\b(senior|lead|principal|staff|sr)\b', re.IGNORECASE)),
+    (Experience.MID, re.compile(r'\b(mid|intermediate)\b', re.IGNORECASE)),
+    (Experience.ENTRY, re.compile(r'\b(entry|junior|jr|graduate|intern)', re.IGNORECASE)),
+)
+
+CURRENCY_SIGNS = {'$': 'USD', '€': 'EUR', '£': 'GBP', '¥': 'JPY', '₹': 'INR'}
+CURRENCY_CODES = re.compile(r'\b(usd|eur|gbp|cad|aud|inr|chf|jpy)\b', re.IGNORECASE)
+# An amount with an optional currency before it ("$", "USD") and an optional
+# multiplier or currency code after it ("80k", "60,000 EUR").
+SALARY_AMOUNT = re.compile(
+    r'(?P<sign>[$€£¥₹]|\b(?:usd|eur|gbp|cad|aud|inr|chf|jpy)\b)?\s*'
+    r'(?P<digits>\d(?:[\d.,]*\d)?)'
+    r'(?:\s*(?P<suffix>k\b|m(?![a-z])))?'
+    r'(?:\s*(?P<code>\b(?:usd|eur|gbp|cad|aud|inr|chf|jpy)\b))?',
+    re.IGNORECASE)
+SALARY_RANGE = re.compile(r'\s*(-|–|—|to)\s*$', re.IGNORECASE)
+# Numbers that are not pay: "10% bonus", "2 years experience", "37.5 hours/week".
+NOT_SALARY = re.compile(r'\s*(%|percent\b|(years?|yrs?|hours?|hrs?|days?|weeks?|months?)\b)', re.IGNORECASE)
+SALARY_PERIOD = re.compile(
+    r'\s*(?:/|per\b|an?\b|each\b|p\.?(?=[hdwmy]))?\s*'
+    r'(?:(?P<hour>hour(ly)?|hr)|(?P<day>day|daily)|(?P<week>week(ly)?|wk)|'
+    r'(?P<month>month(ly)?|mo)|(?P<year>year(ly)?|yr|annum|annual(ly)?|pa))\b',
+    re.IGNORECASE)
+PERIODS_PER_YEAR = {'hour': 2080, 'day': 260, 'week': 52, 'month': 12, 'year': 1}
+
+def _match_enum(text, patterns, unknown):
+    for member, pattern in patterns:
+        if pattern.search(text):
+            return member
+    return unknown
+
+def parse_job_type(text):
+    for member in JobType:
+        if text == member.value:
+            return member
+    return _match_enum(text or '', JOB_TYPE_PATTERNS, JobType.UNKNOWN)
+
+def parse_experience(text):
+    for member in Experience:
+        if text == member.value:
+            return member
+    return _match_enum(text or '', EXPERIENCE_PATTERNS, Experience.UNKNOWN)
+
+def _parse_amount(digits):
+    if re.fullmatch(r'\d{1,3}(,\d{3})+(\.\d+)?', digits):
+        return float(digits.replace(',', ''))
+    if re.fullmatch(r'\d{1,3}(\.\d{3})+(,\d+)?', digits):
+        return float(digits.replace('.', '').replace(',', '.'))
+    try:
+        return float(digits.rstrip('.,').replace(',', '.'))
+    except ValueError:
+        return None
+
+def _salary_amounts(text):
+    # Yields each amount with whether it looks like pay on its own: it has a
+    # currency or a multiplier, or a pay period follows it.
+    for match in SALARY_AMOUNT.finditer(text):
+        after = text[match.end():]
+        currency = match.group('sign') or match.group('code')
+        if not currency and NOT_SALARY.match(after):
+            continue
+        amount = _parse_amount(match.group('digits'))
+        if not amount:
+            continue
+        suffix = (match.group('suffix') or '').lower()
+        multiplier = {'k': 1e3, 'm': 1e6}.get(suffix, 1)
+        is_pay = bool(currency or suffix or SALARY_PERIOD.match(after) or match.group(0).strip() == text.strip())
+        yield match, amount, multiplier, currency, is_pay
+
+def _currency(symbol):
+    return CURRENCY_SIGNS.get(symbol) or symbol.upper()
+
+def parse_salary(text):
+    # "$100,000 - $120,000", "€60k–80k per year", "$45/hr" ->
+    # (minimum, maximum, currency, period); (None, None, None, None) when no
+    # amount can be found. Only the first amount or range that reads as pay
+    # counts, so bonuses, 401k plans and years of experience are ignored.
+    if not text or text == MISSING:
+        return None, None, None, None
+    amounts = list(_salary_amounts(text))
+    for i, (match, amount, multiplier, currency, is_pay) in enumerate(amounts):
+        found = [(match, amount, multiplier, currency)]
+        if i + 1 < len(amounts):
+            following = amounts[i + 1]
+            if SALARY_RANGE.match(text[match.end():following[0].start()]):
+                found.append(following[:4])
+                is_pay = True
+        if is_pay:
+            break
+    else:
+        return None, None, None, None
+    # "60-80k": a bare number next to a suffixed one shares its multiplier.
+    shared = max(multiplier for _, _, multiplier, _ in found)
+    values = [amount * (multiplier if multiplier > 1 or amount >= 1000 else shared)
+              for _, amount, multiplier, _ in found]
+    symbols = [currency for _, _, _, currency in found if currency]
+    if symbols:
+        currency = _currency(symbols[0])
+    else:
+        code = CURRENCY_CODES.search(text)
+        currency = code.group(1).upper() if code else None
+    period = SALARY_PERIOD.match(text, found[-1][0].end())
+    period = next((name for name, value in period.groupdict().items() if value), 'year') if period else 'year'
+    return min(values), max(values), currency, period
+
+def _number(value):
+    # Exports written as CSV read back as strings.
+    if value is None or value == '':
+        return None
+    return float(value)
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+class JobRecord:
+    # One extracted job. Fields are normalised once, when the record is
+    # built, so the UI, filters and exporters never re-parse LLM strings.
+    # Company, location, skills and the enum values repeat across thousands of
+    # results and are interned; __slots__ keeps each record dict-free.
+    __slots__ = ('title', 'company', 'location', 'salary', 'salary_min', 'salary_max',
+                 'salary_currency', 'salary_period', 'job_type', 'experience', 'skills',
+                 'summary', 'url', 'similarity', 'found_at', 'search_seconds')
+
+    def __init__(self, title, company=MISSING, location=MISSING, salary=MISSING,
+                 job_type=JobType.UNKNOWN, experience=Experience.UNKNOWN, skills=(),
+                 summary=MISSING, url='', similarity=None, found_at=None, search_seconds=None):
+        self.title = title
+        self.company = _intern(company)
+        self.location = _intern(location)
+        self.salary = salary
+        self.salary_min, self.salary_max, self.salary_currency, self.salary_period = parse_salary(salary)
+        self.job_type = job_type
+        self.experience = experience
+        self.skills = tuple(_intern(skill) for skill in skills)
+        self.summary = summary
+        self.url = url
+        self.similarity = similarity
+        # Unix time the job was extracted and seconds since its search began.
+        self.found_at = found_at
+        self.search_seconds = search_seconds
+
+    @classmethod
+    def from_job(cls, job, url='', similarity=None, found_at=None, search_seconds=None):
+        # job is a dict validated by job_schema.validate_job, or a row read
+        # back from an export.
+        skills = job.get('skills', ())
+        if isinstance(skills, str):
+            # CSV exports store the list as JSON; older ones joined it with ';'.
+            try:
+                skills = json.loads(skills) if skills.startswith('[') else None
+            except ValueError:
+                skills = None
+            if skills is None:
+                skills = [s.strip() for s in job['skills'].split(';') if s.strip()]
+        return cls(
+            title=job.get('jobTitle', MISSING),
+            company=job.get('company', MISSING),
+            location=job.get('location', MISSING),
+            salary=job.get('salary', MISSING),
+            job_type=parse_job_type(job.get('job_type')),
+            experience=parse_experience(job.get('experience')),
+            skills=skills,
+            summary=job.get('summary', MISSING),
+            url=job.get('url', url),
+            similarity=similarity if similarity is not None else _number(job.get('similarity')),
+            found_at=found_at if found_at is not None else _number(job.get('found_at')),
+            search_seconds=search_seconds if search_seconds is not None else _number(job.get('search_seconds')),
+        )
+
+    def annual_salary(self):
+        # (minimum, maximum) per year, for filtering and sorting across periods.
+        if self.salary_min is None:
+            return None, None
+        factor = PERIODS_PER_YEAR.get(self.salary_period, 1)
+        return self.salary_min * factor, self.salary_max * factor
+
+    def to_dict(self):
+        # Uses the extraction field names, so exports read like the LLM output.
+        return {
+            'jobTitle': self.title,
+            'company': self.company,
+            'location': self.location,
+            'salary': self.salary,
+            'salary_min': self.salary_min,
+            'salary_max': self.salary_max,
+            'salary_currency': self.salary_currency,
+            'salary_period': self.salary_period,
+            'job_type': self.job_type.value,
+            'experience': self.experience.value,
+            'skills': list(self.skills),
+            'summary': self.summary,
+            'url': self.url,
+            'similarity': self.similarity,
+            'found_at': self.found_at,
+            'search_seconds': self.search_seconds,
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        # Records cross process boundaries (search_pool); interning is per
+        # process, so it is redone on arrival.
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+        self.company = _intern(self.company)
+        self.location = _intern(self.location)
+        self.skills = tuple(_intern(skill) for skill in self.skills)
+
+    def __repr__(self):
+        return f"JobRecord({self.title!r}, {self.company!r}, {self.location!r})"
+
+SQL_COLUMNS = ('title', 'company', 'location', 'salary', 'salary_min', 'salary_max',
+               'salary_currency', 'salary_period', 'job_type', 'experience', 'skills',
+               'summary', 'url', 'similarity', 'found_at', 'search_seconds')
+
+def _sql_row(record):
+    return (record.title, record.company, record.location, record.salary, record.salary_min,
+            record.salary_max, record.salary_currency, record.salary_period, record.job_type.value,
+            record.experience.value, json.dumps(record.skills, ensure_ascii=False),
+            record.summary, record.url, record.similarity, record.found_at, record.search_seconds)
+
+def save_sqlite(records, path, table='jobs'):
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(SQL_COLUMNS)})")
+            connection.executemany(
+                f"INSERT INTO {table} VALUES ({', '.join('?' * len(SQL_COLUMNS))})",
+                (_sql_row(record) for record in records))
+    finally:
+        connection.close()
+
+def load_sqlite(path, table='jobs'):
+    connection = sqlite3.connect(path)
+    try:
+        for row in connection.execute(f"SELECT {', '.join(SQL_COLUMNS)} FROM {table}"):
+            values = dict(zip(SQL_COLUMNS, row))
+            yield JobRecord(
+                title=values['title'], company=values['company'], location=values['location'],
+                salary=values['salary'], job_type=JobType(values['job_type']),
+                experience=Experience(values['experience']), skills=json.loads(values['skills']),
+                summary=values['summary'], url=values['url'], similarity=values['similarity'],
+                found_at=values['found_at'], search_seconds=values['search_seconds'])
+    finally:
+        connection.close()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import re
+
+# The fields the extraction prompt asks for and the type each must have.
+# validate_job() coerces LLM output to this shape instead of rejecting it.
+JOB_FIELDS = {
+    'jobTitle': str,
+    'company': str,
+    'location': str,
+    'salary': str,
+    'job_type': str,
+    'experience': str,
+    'skills': list,
+    'summary': str,
+}
+MISSING = "N/A"
+TRUE_STRINGS = ('true', 'yes', '1')
+FALSE_STRINGS = ('false', 'no', '0', 'none', 'null', '')
+
+def coerce_bool(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    if isinstance(value, str):
+        if value.strip().lower() in TRUE_STRINGS:
+            return True
+        if value.strip().lower() in FALSE_STRINGS:
+            return False
+    return None
+
+def _text(value):
+    if isinstance(value, str):
+        return value.strip() or MISSING
+    if isinstance(value, list):
+        return ", ".join(str(v) for v in value if v is not None) or MISSING
+    return str(value)
+
+def _skills(value):
+    if isinstance(value, str):
+        if value.strip() in ('', MISSING):
+            return []
+        return [s.strip() for s in re.split(r"[,;/\n]", value) if s.strip()]
+    return [_text(v) for v in value if v is not None and _text(v) != MISSING]
+
+def validate_job(data):
+    # Returns (job, recovered): the job coerced to JOB_FIELDS and a list of
+    # "field: reason" notes for every field that was missing or had to be
+    # converted. Raises ValueError if relevance cannot be determined.
+    if not isinstance(data, dict):
+        raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+    relevant = coerce_bool(data.get('is_relevant'))
+    if relevant is None:
+        raise ValueError(f"is_relevant is {data.get('is_relevant')!r}")
+    recovered = []
+    if not isinstance(data.get('is_relevant'), bool):
+        recovered.append(f"is_relevant: converted {data.get('is_relevant')!r}")
+    if not relevant:
+        return {'is_relevant': False}, recovered
+
+    job = {'is_relevant': True}
+    for field, kind in JOB_FIELDS.items():
+        value = data.get(field)
+        if value is None:
+            job[field] = [] if kind is list else MISSING
+            recovered.append(f"{field}: missing")
+        elif kind is list:
+            if not isinstance(value, list):
+                recovered.append(f"{field}: converted {type(value).__name__} to list")
+                if not isinstance(value, str):
+                    value = [value]
+            job[field] = _skills(value)
+        else:
+            if not isinstance(value, str):
+                recovered.append(f"{field}: converted {type(value).__name__} to text")
+            job[field] = _text(value)
+    return job, recovered
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+import json
+import re
+
+class IncrementalJSONObjectParser:
+    # Parses a single JSON object as it is streamed in, reporting each top-level
+    # "key": value pair as soon as its value is complete. Anything before the
+    # first '{' (e.g. a ```json fence) is ignored. Single-quoted strings are
+    # accepted, and values json.loads rejects go through the lenient parser.
+    def __init__(self):
+        self.text = ""
+        self.fields = {}
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = None
+        self._escape = False
+        self._string_start = None
+        self._last_string = None
+        self._key = None
+        self._value_start = None
+
+    def feed(self, chunk):
+        completed = []
+        self.text += chunk
+        text = self.text
+        while self._pos < len(text) and not self.done:
+            char = text[self._pos]
+            if self._depth == 0:
+                if char == '{':
+                    self._depth = 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == self._in_string:
+                    self._in_string = None
+                    if self._depth == 1:
+                        self._last_string = self._string_start
+                        if self._value_start is None:
+                            self._key = _LenientParser(text, self._string_start)._string()
+            elif char in '"\'':
+                self._in_string = char
+                self._string_start = self._pos
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete_value(self._pos, completed)
+                    self.done = True
+            elif char == ':' and self._depth == 1:
+                if self._value_start is not None and self._last_string is not None \
+                        and self._last_string > self._value_start:
+                    # Missing comma: the string before this ':' is the next key.
+                    key_start = self._last_string
+                    self._complete_value(key_start, completed)
+                    self._key = _LenientParser(text, key_start)._string()
+                self._value_start = self._pos + 1
+            elif char == ',' and self._depth == 1:
+                self._complete_value(self._pos, completed)
+            self._pos += 1
+        return completed
+
+    def _complete_value(self, end, completed):
+        if self._key is not None and self._value_start is not None:
+            raw = self.text[self._value_start:end].strip()
+            try:
+                value = json.loads(raw)
+            except ValueError:
+                value = _LenientParser(raw).value() if raw else None
+            if raw:
+                self.fields[self._key] = value
+                completed.append((self._key, value))
+        self._key = None
+        self._value_start = None
+
+LITERALS = {'true': True, 'false': False, 'null': None,
+            'True': True, 'False': False, 'None': None}
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f'}
+NUMBER = re.compile(r'-?\d+(\.\d+)?([eE][+-]?\d+)?(?=[\s,\]}]|$)')
+LEADING_ZEROS = re.compile(r'^(-?)0+(?=\d)')
+BARE_KEY = re.compile(r'[^\s:,{}\[\]"\']+')
+BARE_VALUE = re.compile(r'[^,{}\[\]\n]+')
+STRING_RUN = {'"': re.compile(r'[^"\\]*'), "'": re.compile(r"[^'\\]*")}
+
+class _LenientParser:
+    # Recursive-descent parser for the JSON small local models actually write:
+    # trailing or missing commas, unquoted keys and values, single-quoted
+    # strings, Python literals and output cut off mid-object are repaired
+    # rather than rejected. Each repair is recorded with the key path where
+    # it happened so callers can report which fields were recovered.
+    def __init__(self, text, pos=0):
+        self.text = text
+        self.pos = pos
+        self.path = []
+        self.repairs = []
+
+    def _note(self, what):
+        where = ".".join(str(p) for p in self.path) or "<root>"
+        self.repairs.append(f"{where}: {what}")
+
+    def _skip_ws(self):
+        while self.pos < len(self.text) and self.text[self.pos] in ' \t\r\n':
+            self.pos += 1
+        return self.pos < len(self.text)
+
+    def value(self):
+        if not self._skip_ws():
+            self._note("truncated before value")
+            return None
+        char = self.text[self.pos]
+        if char == '{':
+            return self._object()
+        if char == '[':
+            return self._array()
+        if char in '"\'':
+            return self._string()
+        match = NUMBER.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            number = match.group()
+            if LEADING_ZEROS.match(number):
+                self._note(f"leading zeros in {number}")
+                number = LEADING_ZEROS.sub(r'\1', number)
+            return json.loads(number)
+        match = BARE_VALUE.match(self.text, self.pos)
+        if not match:
+            self._note("missing value")
+            return None
+        word = match.group().strip()
+        self.pos = match.end()
+        if word in LITERALS:
+            if word[0].isupper():
+                self._note(f"Python literal {word}")
+            return LITERALS[word]
+        self._note("unquoted value")
+        return word
+
+    def _object(self):
+        self.pos += 1
+        obj = {}
+        separated = True
+        while True:
+            if not self._skip_ws():
+                self._note("truncated object")
+                return obj
+            char = self.text[self.pos]
+            if char == '}':
+                self.pos += 1
+                return obj
+            if char == ']':
+                self._note("mismatched ']'")
+                self.pos += 1
+                return obj
+            if char == ',':
+                self.pos += 1
+                separated = True
+                if self._skip_ws() and self.text[self.pos] == '}':
+                    self._note("trailing comma")
+                continue
+            missing_comma = not separated
+            separated = False
+            if char in '"\'':
+                key = self._string()
+            else:
+                match = BARE_KEY.match(self.text, self.pos)
+                if not match:
+                    self._note(f"skipped unexpected {char!r}")
+                    self.pos += 1
+                    separated = not missing_comma
+                    continue
+                key = match.group()
+                self.pos = match.end()
+                self._note(f"unquoted key '{key}'")
+            if missing_comma:
+                self._note(f"missing ',' before '{key}'")
+            if not self._skip_ws():
+                self._note(f"truncated after key '{key}'")
+                return obj
+            if self.text[self.pos] == ':':
+                self.pos += 1
+            else:
+                self._note(f"missing ':' after '{key}'")
+            if not self._skip_ws():
+                self._note(f"truncated before value of '{key}'")
+                return obj
+            self.path.append(key)
+            obj[key] = self.value()
+            self.path.pop()
+
+    def _array(self):
+        self.pos += 1
+        items = []
+        separated = True
+        while True:
+            if not self._skip_ws():
+                self._note("truncated array")
+                return items
+            char = self.text[self.pos]
+            if char == ']':
+                self.pos += 1
+                return items
+            if char == '}':
+                # Leave it for the enclosing object.
+                self._note("mismatched '}'")
+                return items
+            if char == ',':
+                self.pos += 1
+                separated = True
+                if self._skip_ws() and self.text[self.pos] == ']':
+                    self._note("trailing comma")
+                continue
+            if not separated:
+                self._note(f"missing ',' before item {len(items)}")
+            separated = False
+            self.path.append(len(items))
+            items.append(self.value())
+            self.path.pop()
+
+    def _string(self):
+        quote = self.text[self.pos]
+        if quote == "'":
+            self._note("single-quoted string")
+        run = STRING_RUN[quote]
+        self.pos += 1
+        parts = []
+        while True:
+            match = run.match(self.text, self.pos)
+            parts.append(match.group())
+            self.pos = match.end()
+            if self.pos >= len(self.text):
+                self._note("truncated string")
+                return "".join(parts)
+            if self.text[self.pos] == quote:
+                self.pos += 1
+                return "".join(parts)
+            # Backslash escape.
+            escaped = self.text[self.pos + 1:self.pos + 2]
+            if escaped == 'u' and len(self.text) >= self.pos + 6:
+                try:
+                    parts.append(chr(int(self.text[self.pos + 2:self.pos + 6], 16)))
+                    self.pos += 6
+                    continue
+                except ValueError:
+                    pass
+            parts.append(ESCAPES.get(escaped, escaped))
+            self.pos += 2
+
+def parse_json_lenient(text):
+    # Returns (value, repairs) for the first JSON object in text, or the first
+    # array if there is no object: the prompts always ask for an object, and
+    # a '[' before it is usually prose ("Note [1]: ..."). Well-formed output
+    # takes the C decoder's fast path; anything after the value (closing
+    # code fences, commentary) is ignored.
+    start = text.find('{')
+    if start == -1:
+        start = text.find('[')
+    if start == -1:
+        raise ValueError("No JSON found")
+    try:
+        return json.JSONDecoder().raw_decode(text, start)[0], []
+    except ValueError:
+        pass
+    parser = _LenientParser(text, start)
+    return parser.value(), parser.repairs
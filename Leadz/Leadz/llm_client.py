@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import abc
+import threading
+
+from settings import get_settings
+
+class LLMClient(abc.ABC):
+    # Backends implement stream_chat(); everything else has a default.
+    def __init__(self, model=None, keep_alive=None):
+        settings = get_settings()
+        self.model = model or settings.llm_model
+        self.keep_alive = keep_alive if keep_alive is not None else settings.llm_keep_alive
+
+    @abc.abstractmethod
+    def stream_chat(self, messages, format="json"):
+        pass
+
+    def chat(self, messages, format="json"):
+        return "".join(self.stream_chat(messages, format=format))
+
+    def preload(self):
+        pass
+
+    def unload(self):
+        pass
+
+class OllamaLLMClient(LLMClient):
+    # One ollama.Client per process: its underlying httpx client keeps the
+    # connection to the Ollama server alive between requests, and keep_alive
+    # stops the server from unloading the model between searches.
+    def __init__(self, host=None, model=None, keep_alive=None):
+        super().__init__(model=model, keep_alive=keep_alive)
+        self.host = host or get_settings().llm_host
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                import ollama
+                self._client = ollama.Client(host=self.host)
+            return self._client
+
+    def stream_chat(self, messages, format="json"):
+        stream = self.client.chat(model=self.model, messages=messages, format=format,
+                                  stream=True, keep_alive=self.keep_alive)
+        try:
+            for part in stream:
+                content = part['message']['content']
+                if content:
+                    yield content
+        finally:
+            # Closing the stream early drops the HTTP response, which makes
+            # Ollama stop generating.
+            stream.close()
+
+    def preload(self):
+        # A chat request without messages loads the model and returns immediately.
+        self.client.chat(model=self.model, messages=[], keep_alive=self.keep_alive)
+
+    def unload(self):
+        self.client.chat(model=self.model, messages=[], keep_alive=0)
+
+LLM_BACKENDS = {
+    'ollama': OllamaLLMClient,
+}
+
+_llm_client = None
+_llm_client_lock = threading.Lock()
+
+def register_llm_backend(name, factory):
+    LLM_BACKENDS[name] = factory
+
+def get_llm_client():
+    global _llm_client
+    with _llm_client_lock:
+        if _llm_client is None:
+            backend = get_settings().llm_backend
+            if backend not in LLM_BACKENDS:
+                raise ValueError(f"Unknown LLM backend: {backend}")
+            _llm_client = LLM_BACKENDS[backend]()
+        return _llm_client
@@ -1,15 +1,18 @@
 # -*- coding: utf-8 -*-
-from PySide6.QtCore import Qt, QSize
+from pathlib import Path
+
+from PySide6.QtCore import Qt, QSize, QTimer
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QLineEdit, QPushButton, QLabel, 
-                               QScrollArea, QFrame, QSystemTrayIcon,
-                               QMenu, QComboBox)
+                               QFrame, QSystemTrayIcon, QMenu, QComboBox,
+                               QTabWidget, QFileDialog)
 from PySide6.QtGui import QFont, QIcon, QAction, QPixmap, QImage
 
 from config import THEMES
+from results_export import open_writer, read_jobs
 from theme_manager import ThemeManager
-from search_worker import JobSearchWorker
-from ui_components import CustomTitleBar, JobCard
+from pool_worker import SearchPoolWorker
+from ui_components import CustomTitleBar, SearchTab
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -18,6 +21,16 @@ class MainWindow(QMainWindow):
         self.theme_manager = ThemeManager()
         self.setWindowTitle("Leadz")
         self.setGeometry(100, 100, 900, 750)
+        self.search_tabs = {}
+        self.exporter = None
+        self.exported_count = 0
+        self.import_timer = QTimer(self)
+        self.import_timer.timeout.connect(self.load_import_chunk)
+        self._imports = []
+        # Every way out of the app (tray menu, closing the window, session
+        # end) closes the export, so a Parquet file gets its last row group
+        # and footer, and stops the search processes.
+        QApplication.instance().aboutToQuit.connect(self.shutdown)
         
         icon = self.create_app_icon()
         self.setWindowIcon(icon)
@@ -26,7 +39,24 @@ class MainWindow(QMainWindow):
         self.setup_ui()
         self.apply_theme()
         
-        self.worker = None
+        self.pool_worker = SearchPoolWorker()
+        self.pool_worker.status_update.connect(self.update_status)
+        self.pool_worker.job_found.connect(self.add_job_card)
+        self.pool_worker.job_progress.connect(self.show_job_progress)
+        self.pool_worker.search_started.connect(self.search_started)
+        self.pool_worker.search_finished.connect(self.search_finished)
+        self.pool_worker.pool_message.connect(self.show_pool_message)
+
+    def start_warmup(self):
+        # Starts the search processes, which load the models in the background.
+        if self.pool_worker.isRunning():
+            return
+        self.status_label.setText("Loading search components in the background...")
+        self.pool_worker.start()
+
+    def show_pool_message(self, message):
+        if self.results_tabs.count() == 0:
+            self.status_label.setText(message)
 
     def create_app_icon(self):
         return QIcon("C:/Users/Admin/source/repos/Leadz/assets/Leadz.ico")
@@ -84,6 +114,16 @@ class MainWindow(QMainWindow):
         header_layout.addWidget(self.title_label)
         
         header_layout.addStretch()
+
+        self.import_button = QPushButton("Import...")
+        self.import_button.setObjectName("header_button")
+        self.import_button.clicked.connect(self.import_results)
+        header_layout.addWidget(self.import_button)
+
+        self.export_button = QPushButton("Export...")
+        self.export_button.setObjectName("header_button")
+        self.export_button.clicked.connect(self.toggle_export)
+        header_layout.addWidget(self.export_button)
         
         theme_label = QLabel("Theme:")
         header_layout.addWidget(theme_label)
@@ -102,19 +142,13 @@ class MainWindow(QMainWindow):
         separator.setFrameShadow(QFrame.Sunken)
         content_layout.addWidget(separator)
         
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFrameShape(QFrame.NoFrame)
-        self.scroll_area.setLineWidth(0)
-        
-        self.results_container = QWidget()
-        self.results_layout = QVBoxLayout(self.results_container)
-        self.results_layout.setContentsMargins(25, 20, 25, 20)
-        self.results_layout.setSpacing(15)
-        self.results_layout.setAlignment(Qt.AlignTop)
-        
-        self.scroll_area.setWidget(self.results_container)
-        content_layout.addWidget(self.scroll_area, 1)
+        self.results_tabs = QTabWidget()
+        self.results_tabs.setTabsClosable(True)
+        self.results_tabs.setMovable(True)
+        self.results_tabs.setDocumentMode(True)
+        self.results_tabs.tabCloseRequested.connect(self.close_search_tab)
+        self.results_tabs.currentChanged.connect(self.show_current_tab_status)
+        content_layout.addWidget(self.results_tabs, 1)
         
         footer = QFrame()
         footer.setObjectName("footer")
@@ -203,6 +237,10 @@ class MainWindow(QMainWindow):
             QLineEdit:focus {{
                 border: 1px solid {highlight};
             }}
+            QWidget#filter_bar QLineEdit {{
+                padding: 5px 8px;
+                font-size: 9pt;
+            }}
             QPushButton#search_button {{
                 background-color: transparent;
                 border: none;
@@ -217,7 +255,33 @@ class MainWindow(QMainWindow):
             QPushButton#search_button:disabled {{
                 background-color: {button_bg};
             }}
+            QPushButton#header_button {{
+                background-color: {button_bg};
+                color: {button_text};
+                border: 1px solid {border};
+                border-radius: 6px;
+                padding: 6px 12px;
+                font-size: 9pt;
+            }}
+            QPushButton#header_button:hover {{
+                border: 1px solid {highlight};
+            }}
             QScrollArea {{ background-color: {base}; border: none; }}
+            QTabWidget::pane {{ border: none; }}
+            QTabBar::tab {{
+                background-color: {bg};
+                color: {text};
+                border: none;
+                border-bottom: 2px solid transparent;
+                padding: 6px 14px;
+                font-size: 9pt;
+            }}
+            QTabBar::tab:selected {{
+                border-bottom: 2px solid {highlight};
+            }}
+            QTabBar::tab:hover {{
+                background-color: {button_bg};
+            }}
             QScrollBar:vertical {{
                 border: none;
                 background: {base};
@@ -297,10 +361,13 @@ class MainWindow(QMainWindow):
         except Exception as e:
             print(f"Error loading button icon: {e}")
 
-        for i in range(self.results_layout.count()):
-            widget = self.results_layout.itemAt(i).widget()
-            if isinstance(widget, JobCard):
-                widget.refresh_theme()
+        for tab in self.result_tabs():
+            tab.refresh_theme()
+
+    def result_tabs(self):
+        # Search tabs and imported tabs, in tab order. Imported tabs have no
+        # job id, so they are not in search_tabs.
+        return [self.results_tabs.widget(i) for i in range(self.results_tabs.count())]
 
     def change_theme(self, theme_name):
         self.theme_manager.save_theme(theme_name)
@@ -308,34 +375,172 @@ class MainWindow(QMainWindow):
 
     def start_search(self):
         query = self.query_input.text().strip()
-        if not query or (self.worker and self.worker.isRunning()):
+        if not query:
+            return
+        if not self.pool_worker.isRunning():
+            self.start_warmup()
+        self.query_input.clear()
+        # Searches started from the window run ahead of queued batch work.
+        job_id = self.pool_worker.submit(query, priority=1)
+        tab = SearchTab(job_id, query, self.theme_manager)
+        self.search_tabs[job_id] = tab
+        title = query if len(query) <= 24 else query[:23] + "\u2026"
+        index = self.results_tabs.addTab(tab, title)
+        self.results_tabs.setTabToolTip(index, query)
+        self.results_tabs.setCurrentIndex(index)
+        self.show_current_tab_status()
+
+    def set_tab_status(self, job_id, message):
+        tab = self.search_tabs.get(job_id)
+        if tab is None:
+            return
+        tab.status_text = message
+        if self.results_tabs.currentWidget() is tab:
+            self.status_label.setText(message)
+
+    def show_current_tab_status(self, index=None):
+        tab = self.results_tabs.currentWidget()
+        if tab is not None:
+            self.status_label.setText(tab.status_text)
+
+    def update_status(self, job_id, message):
+        self.set_tab_status(job_id, message)
+
+    def show_job_progress(self, job_id, partial_job):
+        title = partial_job.get('jobTitle')
+        if not title:
+            return
+        company = partial_job.get('company')
+        self.set_tab_status(job_id, f"Extracting: {title}" + (f" at {company}" if company else "") + "...")
+
+    def add_job_card(self, job_id, job):
+        tab = self.search_tabs.get(job_id)
+        if tab is not None:
+            tab.add_job_card(job)
+            self.export_job(job, tab)
+
+    def toggle_export(self):
+        # Once started, every job found is appended to the file as it
+        # arrives, until the export is stopped.
+        if self.exporter is not None:
+            self.stop_export()
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export results", "leadz_results.jsonl",
+            "JSON Lines (*.jsonl);;CSV (*.csv);;Parquet (*.parquet)")
+        if path:
+            self.start_export(path)
+
+    def start_export(self, path):
+        try:
+            self.exporter = open_writer(path)
+        except Exception as e:
+            self.status_label.setText(f"Export failed: {e}")
+            return
+        self.exported_count = 0
+        self.export_button.setText("Stop export (0)")
+        self.export_button.setToolTip(path)
+        for tab in self.result_tabs():
+            for job in tab.index.jobs:
+                self.export_job(job, tab)
+
+    def export_job(self, job, tab):
+        if self.exporter is None:
+            return
+        try:
+            self.exporter.write(job, query=tab.query, search_id=tab.job_id)
+            self.exported_count += 1
+            self.export_button.setText(f"Stop export ({self.exported_count})")
+        except Exception as e:
+            self.status_label.setText(f"Export failed: {e}")
+            self.stop_export()
+
+    def stop_export(self):
+        if self.exporter is None:
             return
-        self.clear_results()
-        self.search_button.setEnabled(False)
-        self.status_label.setText("Searching...")
-        self.worker = JobSearchWorker(query)
-        self.worker.status_update.connect(self.update_status)
-        self.worker.job_found.connect(self.add_job_card)
-        self.worker.finished.connect(self.search_finished)
-        self.worker.start()
-
-    def update_status(self, message):
-        self.status_label.setText(message)
-
-    def add_job_card(self, job_data):
-        card = JobCard(job_data, self.theme_manager)
-        self.results_layout.addWidget(card)
-
-    def search_finished(self):
-        self.search_button.setEnabled(True)
-        if self.results_layout.count() == 0:
-            self.status_label.setText("Search complete. No relevant jobs found.")
-
-    def clear_results(self):
-        while self.results_layout.count():
-            child = self.results_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        try:
+            self.exporter.close()
+        except Exception as e:
+            print(f"Error closing export: {e}")
+        self.exporter = None
+        self.export_button.setText("Export...")
+
+    def import_results(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import results", "",
+            "Leadz results (*.jsonl *.json *.csv *.parquet)")
+        if path:
+            self.open_import(path)
+
+    def open_import(self, path):
+        # Chunks are loaded one per event loop turn, so a large file fills
+        # its tab progressively without freezing the window.
+        try:
+            chunks = read_jobs(path)
+        except ValueError as e:
+            self.status_label.setText(str(e))
+            return
+        name = Path(path).name
+        tab = SearchTab(None, name, self.theme_manager)
+        tab.is_finished = True
+        tab.status_text = f"Importing {name}..."
+        index = self.results_tabs.addTab(tab, name if len(name) <= 24 else name[:23] + "\u2026")
+        self.results_tabs.setTabToolTip(index, path)
+        self.results_tabs.setCurrentIndex(index)
+        self._imports.append((tab, chunks))
+        self.show_current_tab_status()
+        self.import_timer.start(0)
+
+    def load_import_chunk(self):
+        if not self._imports:
+            self.import_timer.stop()
+            return
+        tab, chunks = self._imports[0]
+        done = self.results_tabs.indexOf(tab) == -1
+        if not done:
+            try:
+                chunk = next(chunks)
+                tab.add_jobs(chunk)
+                for job in chunk:
+                    self.export_job(job, tab)
+                tab.status_text = f"Importing... {tab.job_count()} jobs loaded."
+            except StopIteration:
+                tab.status_text = f"Imported {tab.job_count()} jobs."
+                done = True
+            except Exception as e:
+                tab.status_text = f"Import stopped after {tab.job_count()} jobs: {e}"
+                done = True
+            if self.results_tabs.currentWidget() is tab:
+                self.status_label.setText(tab.status_text)
+        if done:
+            self._imports.pop(0)
+
+    def search_started(self, job_id):
+        self.set_tab_status(job_id, "Searching...")
+
+    def search_finished(self, job_id):
+        tab = self.search_tabs.get(job_id)
+        if tab is None:
+            return
+        tab.is_finished = True
+        if tab.job_count() == 0:
+            self.set_tab_status(job_id, "Search complete. No relevant jobs found.")
+        else:
+            self.set_tab_status(job_id, f"Search complete. Found {tab.job_count()} jobs.")
+
+    def close_search_tab(self, index):
+        tab = self.results_tabs.widget(index)
+        self.results_tabs.removeTab(index)
+        if tab is None:
+            return
+        # Queued searches are cancelled; a running one finishes in the
+        # background and its results are discarded.
+        if not tab.is_finished:
+            self.pool_worker.cancel(tab.job_id)
+        self.search_tabs.pop(tab.job_id, None)
+        tab.deleteLater()
+        if self.results_tabs.count() == 0:
+            self.status_label.setText("Ready to search. Enter a job title or description.")
 
     def show_window(self):
         self.showNormal()
@@ -345,8 +550,15 @@ class MainWindow(QMainWindow):
     def hide_window(self):
         self.hide()
 
+    def shutdown(self):
+        self.stop_export()
+        if self.pool_worker.isRunning():
+            self.pool_worker.stop()
+            self.pool_worker.wait()
+
     def quit_app(self):
         self.tray_icon.hide()
+        self.shutdown()
         QApplication.quit()
 
     def changeEvent(self, event):
@@ -363,4 +575,5 @@ class MainWindow(QMainWindow):
             self.hide()
             event.ignore()
         else:
+            self.shutdown()
             event.accept()
\ No newline at end of file
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# A stand-in for the Ollama server that speaks the subset of its HTTP API used
+# by llm_client.OllamaLLMClient (/api/chat, streamed or not). Point the app at
+# it with OLLAMA_HOST=http://127.0.0.1:11435 to run searches or benchmarks
+# without a GPU or a downloaded model.
+
+class MockLLMState:
+    def __init__(self, token_delay=0.01, chars_per_token=4, relevant_rate=0.25, load_delay=0.0):
+        self.token_delay = token_delay
+        self.chars_per_token = chars_per_token
+        self.relevant_rate = relevant_rate
+        self.load_delay = load_delay
+        self.loaded_models = set()
+        self.requests = 0
+        self.tokens_generated = 0
+        self.aborted = 0
+        self.lock = threading.Lock()
+
+    def respond(self, messages):
+        prompt = "\n".join(m.get('content', '') for m in messages)
+        if '"queries"' in prompt:
+            match = re.search(r'query:\s*"([^"]*)"', prompt)
+            query = match.group(1) if match else "software engineer"
+            return json.dumps({"queries": [f"{query} jobs", f"{query} careers", f"{query} hiring"]})
+
+        if '"results"' in prompt:
+            pages = re.split(r"^Page \d+:\n", messages[-1].get('content', ''), flags=re.MULTILINE)[1:]
+            results = []
+            for number, text in enumerate(pages, 1):
+                job = self._verdict(text)
+                results.append(dict({"page": number}, **job))
+            return json.dumps({"results": results}, indent=2)
+        job = self._verdict(prompt)
+        return json.dumps(job, indent=2 if job['is_relevant'] else None)
+
+    def _verdict(self, text):
+        digest = hashlib.sha1(text.encode('utf-8')).digest()
+        if digest[0] / 255 >= self.relevant_rate:
+            return {"is_relevant": False}
+        return {
+            "is_relevant": True,
+            "jobTitle": "Mock Software Engineer",
+            "company": "Mock Corp",
+            "location": "Remote",
+            "salary": "$100,000 - $120,000",
+            "job_type": "Full-time",
+            "experience": "Mid-level",
+            "skills": ["Python", "SQL", "Docker"],
+            "summary": "A mock job generated by the local mock LLM server. It is only used for testing.",
+        }
+
+class MockOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle(self):
+        # Clients drop streamed connections as soon as they have what they need.
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send_json(self, obj):
+        body = json.dumps(obj).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, obj):
+        data = (json.dumps(obj) + "\n").encode('utf-8')
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path in ('/', '/api/version'):
+            self._send_json({"version": "mock"})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        if self.path != '/api/chat':
+            self.send_error(404)
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        state = self.state
+        model = request.get('model', 'mock')
+        messages = request.get('messages') or []
+
+        with state.lock:
+            state.requests += 1
+            needs_load = model not in state.loaded_models
+            state.loaded_models.add(model)
+        if needs_load:
+            time.sleep(state.load_delay)
+        if request.get('keep_alive') in (0, '0', '0s'):
+            with state.lock:
+                state.loaded_models.discard(model)
+
+        content = state.respond(messages) if messages else ""
+        step = state.chars_per_token
+        tokens = [content[i:i + step] for i in range(0, len(content), step)]
+        base = {"model": model, "created_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}
+
+        if not request.get('stream', True):
+            time.sleep(state.token_delay * len(tokens))
+            with state.lock:
+                state.tokens_generated += len(tokens)
+            self._send_json(dict(base, message={"role": "assistant", "content": content},
+                                 done=True, done_reason="stop"))
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for token in tokens:
+                time.sleep(state.token_delay)
+                self._write_chunk(dict(base, message={"role": "assistant", "content": token}, done=False))
+                with state.lock:
+                    state.tokens_generated += 1
+            self._write_chunk(dict(base, message={"role": "assistant", "content": ""},
+                                   done=True, done_reason="stop"))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            with state.lock:
+                state.aborted += 1
+            self.close_connection = True
+
+def start_mock_server(port=11435, **state_options):
+    handler = type('BoundMockOllamaHandler', (MockOllamaHandler,), {'state': MockLLMState(**state_options)})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def run_benchmark(server, requests_count):
+    from llm_client import OllamaLLMClient
+
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+    client = OllamaLLMClient(host=host, model='mock')
+    client.preload()
+    prompt = [{'role': 'user', 'content': "Analyze this job page."}]
+
+    start = time.perf_counter()
+    for i in range(requests_count):
+        prompt[0]['content'] = f"Analyze this job page #{i}."
+        client.chat(prompt)
+    elapsed = time.perf_counter() - start
+
+    state = server.RequestHandlerClass.state
+    print(f"{requests_count} requests in {elapsed:.2f} s "
+          f"({elapsed / requests_count * 1000:.1f} ms/request, {state.tokens_generated} tokens, "
+          f"{state.aborted} aborted)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Ollama server for Leadz tests and benchmarks")
+    parser.add_argument('--port', type=int, default=11435)
+    parser.add_argument('--token-delay-ms', type=float, default=10.0)
+    parser.add_argument('--load-delay-ms', type=float, default=0.0,
+                        help="simulated model load time on the first request for a model")
+    parser.add_argument('--relevant-rate', type=float, default=0.25,
+                        help="fraction of extraction prompts answered with a relevant job")
+    parser.add_argument('--benchmark', type=int, metavar='N', default=0,
+                        help="run N chat requests against the server and exit")
+    args = parser.parse_args()
+
+    server = start_mock_server(args.port, token_delay=args.token_delay_ms / 1000,
+                               load_delay=args.load_delay_ms / 1000,
+                               relevant_rate=args.relevant_rate)
+    if args.benchmark:
+        run_benchmark(server, args.benchmark)
+        server.shutdown()
+        return
+
+    print(f"Mock Ollama server listening on http://127.0.0.1:{args.port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
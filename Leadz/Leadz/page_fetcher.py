@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import requests
+from bs4 import BeautifulSoup
+
+from settings import get_settings
+
+REQUEST_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+TEXT_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+BINARY_SIGNATURES = (b'%PDF', b'PK\x03\x04', b'\x89PNG', b'GIF8', b'\xff\xd8\xff', b'\x1f\x8b')
+
+class UnsupportedContent(Exception):
+    pass
+
+class PageRecord:
+    # Only the first max_page_chars of the cleaned text is kept, and a record
+    # carries no per-instance dict, so holding every fetched page until ranking
+    # finishes costs a bounded amount of memory per page.
+    __slots__ = ('url', 'text', 'similarity', 'relevance_features')
+
+    def __init__(self, url, text):
+        self.url = url
+        self.text = text
+        self.similarity = None
+        self.relevance_features = None
+
+def create_session():
+    session = requests.Session()
+    session.headers.update(REQUEST_HEADERS)
+    return session
+
+def _read_capped(response, max_bytes):
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(chunk_size=16384):
+        if not chunks:
+            head = chunk[:1024]
+            if head.lstrip().startswith(BINARY_SIGNATURES) or b'\x00' in head:
+                raise UnsupportedContent("binary content")
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= max_bytes:
+            break
+    return b''.join(chunks)[:max_bytes]
+
+def clean_html(raw, encoding=None):
+    soup = BeautifulSoup(raw, 'html.parser', from_encoding=encoding)
+    for tag in soup(["script", "style", "nav", "footer", "header", "aside"]):
+        tag.extract()
+    text = soup.get_text(separator=' ', strip=True)
+    soup.decompose()
+    return text
+
+def fetch_page(session, url, timeout=None, max_bytes=None, max_chars=None):
+    settings = get_settings()
+    timeout = timeout or settings.fetch_timeout
+    max_bytes = max_bytes or settings.max_page_bytes
+    max_chars = max_chars or settings.max_page_chars
+    with session.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in TEXT_CONTENT_TYPES:
+            raise UnsupportedContent(f"content type {content_type}")
+        # Only trust the charset when the server declared one; otherwise let
+        # BeautifulSoup detect it from the document.
+        encoding = response.encoding if 'charset' in response.headers.get('Content-Type', '') else None
+        raw = _read_capped(response, max_bytes)
+    return PageRecord(url, clean_html(raw, encoding)[:max_chars])
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import itertools
+import threading
+
+from PySide6.QtCore import QThread, Signal
+
+# The GUI side of search_pool. Kept apart from search_worker so the search
+# processes and batch_search.py never import Qt.
+
+class SearchPoolWorker(QThread):
+    # Runs the search_pool event loop for the GUI and turns pool events into
+    # Qt signals keyed by job id. Searches submitted before the pool has
+    # started are queued and handed over once it is up.
+    status_update = Signal(int, str)
+    job_found = Signal(int, object)
+    job_progress = Signal(int, dict)
+    search_started = Signal(int)
+    search_finished = Signal(int)
+    pool_message = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.pool = None
+        self._early_submissions = []
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stopping = False
+
+    def submit(self, query, priority=0):
+        job_id = next(self._job_ids)
+        with self._lock:
+            if self.pool is None:
+                self._early_submissions.append((query, priority, job_id))
+            else:
+                self.pool.submit(query, priority, job_id)
+        return job_id
+
+    def cancel(self, job_id):
+        with self._lock:
+            if self.pool is None:
+                self._early_submissions = [s for s in self._early_submissions if s[2] != job_id]
+                return True
+            return self.pool.cancel(job_id)
+
+    def stop(self):
+        self._stopping = True
+
+    def run(self):
+        from search_pool import SearchPool
+
+        pool = SearchPool()
+        pool.start()
+        with self._lock:
+            self.pool = pool
+            for query, priority, job_id in self._early_submissions:
+                pool.submit(query, priority, job_id)
+            self._early_submissions = []
+        self.pool_message.emit("Ready to search. Enter a job title or description.")
+
+        while not self._stopping:
+            event = pool.get_event(timeout=0.2)
+            if event is None:
+                continue
+            kind, job_id, payload = event
+            if kind == 'status':
+                self.status_update.emit(job_id, payload)
+            elif kind == 'job':
+                self.job_found.emit(job_id, payload)
+            elif kind == 'progress':
+                self.job_progress.emit(job_id, payload)
+            elif kind == 'started':
+                self.search_started.emit(job_id)
+            elif kind in ('finished', 'cancelled'):
+                self.search_finished.emit(job_id)
+            elif kind == 'error':
+                print(f"ERROR: {payload}")
+                self.pool_message.emit(payload)
+        pool.shutdown()
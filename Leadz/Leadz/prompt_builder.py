@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import re
+from collections import Counter, defaultdict
+
+from host_health import host_of
+from settings import get_settings
+
+# Prompts are split into a constant system message and a short user message
+# with the query and page text. The system message is byte-identical for every
+# page and every search, so Ollama can reuse the evaluated prefix from its KV
+# cache and only has to process the user message for each page.
+
+EXTRACTION_INSTRUCTIONS = """You extract job postings from web page text.
+Decide whether the text contains a job posting highly relevant to the user's query.
+- If not, respond ONLY with: {"is_relevant": false}
+- If it does, respond ONLY with this JSON object, using "N/A" for missing fields:
+{"is_relevant": true, "jobTitle": "...", "company": "...", "location": "...", "salary": "...", "job_type": "Full-time | Part-time | Contract | N/A", "experience": "Entry-level | Mid-level | Senior | N/A", "skills": ["3-5 key technologies or qualifications"], "summary": "2-3 sentences"}"""
+
+BATCH_EXTRACTION_INSTRUCTIONS = """You extract job postings from several web pages at once.
+For each numbered page, decide whether it contains a job posting highly relevant to the user's query.
+Respond ONLY with JSON: {"results": [one object per page, in page order]}
+- For an irrelevant page: {"page": 1, "is_relevant": false}
+- For a relevant page, using "N/A" for missing fields:
+{"page": 2, "is_relevant": true, "jobTitle": "...", "company": "...", "location": "...", "salary": "...", "job_type": "Full-time | Part-time | Contract | N/A", "experience": "Entry-level | Mid-level | Senior | N/A", "skills": ["3-5 key technologies or qualifications"], "summary": "2-3 sentences"}"""
+
+QUERY_INSTRUCTIONS = """You are a technical recruiter. From the user's query, infer the job title, skills, location and seniority, and generate 3-5 diverse web search queries that find matching job postings.
+Respond ONLY with JSON: {"queries": ["...", "..."]}"""
+
+QUERY_GENERAL_HINT = 'Use synonyms and job title variations, and add words like "jobs", "careers" or "hiring".'
+QUERY_RETRY_HINT = ("The last search found too few jobs. Make the queries more specific and give every "
+                    "one a site: restriction for a job board, e.g. site:linkedin.com, site:greenhouse.io, site:lever.co.")
+
+# Sentences that are page chrome rather than posting content.
+BOILERPLATE_PATTERNS = re.compile(
+    r"cookie|accept all|privacy policy|terms of (use|service)|all rights reserved|"
+    r"sign in|log in|create (an )?account|subscribe|newsletter|enable javascript|"
+    r"share (this|on)|follow us|skip to (main )?content|back to (top|search)",
+    re.IGNORECASE)
+# Everything after one of these is a list of other jobs.
+TRAILING_LIST_MARKERS = re.compile(
+    r"\b(similar jobs|related jobs|more jobs like this|people also viewed|"
+    r"jobs you may (also )?like|recommended jobs|other jobs at)\b",
+    re.IGNORECASE)
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\s+[|•·]\s+")
+
+SHARED_SEGMENT_PAGES = 3 # a sentence on this many pages is treated as boilerplate
+MAX_SHARED_FRACTION = 0.6 # never strip more than this much of a page as shared text
+
+def estimate_tokens(text, chars_per_token=None):
+    # A character-count estimate is close enough for budgeting (within ~10% of
+    # the real tokenizer for English prose) and costs nothing to compute.
+    chars_per_token = chars_per_token or get_settings().prompt_chars_per_token
+    return int(len(text) / chars_per_token) + 1
+
+def _key(segment):
+    normalized = re.sub(r"\W+", " ", segment.lower()).strip()
+    return hashlib.sha1(normalized.encode('utf-8')).digest()[:8]
+
+def split_segments(text):
+    return [s for s in SENTENCE_SPLIT.split(text) if s.strip()]
+
+class PromptBuilder:
+    # Built once per batch of pages: observe() counts which sentences repeat
+    # across pages so page_text() can drop site-wide chrome (the same footer on
+    # every page of a job board, shared EEO statements) before fitting each
+    # page into the token budget.
+    def __init__(self, settings=None):
+        self.settings = settings or get_settings()
+        self._pages_with = Counter()
+        self._hosts_with = defaultdict(set)
+
+    def observe(self, pages):
+        for page in pages:
+            host = host_of(page.url)
+            for key in {_key(s) for s in split_segments(page.text)}:
+                self._pages_with[key] += 1
+                self._hosts_with[key].add(host)
+
+    def _is_shared(self, key, host):
+        if self._pages_with[key] >= SHARED_SEGMENT_PAGES:
+            return True
+        # Repeated on two pages of the same site: navigation or footer text.
+        return self._pages_with[key] >= 2 and self._hosts_with[key] == {host}
+
+    def page_text(self, page, token_budget=None):
+        token_budget = token_budget or self.settings.extraction_token_budget
+        host = host_of(page.url)
+        text = page.text
+        marker = TRAILING_LIST_MARKERS.search(text, len(text) // 4)
+        if marker:
+            text = text[:marker.start()]
+
+        seen = set()
+        kept = []
+        shared = []
+        for segment in split_segments(text):
+            key = _key(segment)
+            if key in seen or (len(segment) < 300 and BOILERPLATE_PATTERNS.search(segment)):
+                continue
+            seen.add(key)
+            kept.append(segment)
+            shared.append(self._is_shared(key, host))
+
+        # Pages that are mostly shared text (e.g. the same posting found twice)
+        # keep everything rather than losing the posting itself.
+        if sum(shared) <= MAX_SHARED_FRACTION * len(kept):
+            kept = [s for s, is_shared in zip(kept, shared) if not is_shared]
+
+        budget = token_budget * self.settings.prompt_chars_per_token
+        out = []
+        used = 0
+        for segment in kept:
+            if used + len(segment) + 1 > budget:
+                if not out:
+                    out.append(segment[:int(budget)])
+                break
+            out.append(segment)
+            used += len(segment) + 1
+        return " ".join(out)
+
+    def extraction_messages(self, query, page, text=None):
+        if text is None:
+            text = self.page_text(page)
+        return [
+            {'role': 'system', 'content': EXTRACTION_INSTRUCTIONS},
+            {'role': 'user', 'content': f'User\'s query: "{query}"\n\nText:\n{text}'},
+        ]
+
+    def batches(self, pages):
+        # Packs consecutive pages whose trimmed text fits together into one
+        # request of at most extraction_batch_size pages. Long pages end up
+        # in batches of their own and go through the single-page path.
+        max_pages = max(1, self.settings.extraction_batch_size)
+        budget = self.settings.extraction_batch_token_budget
+        batches = []
+        batch = []
+        used = 0
+        for page in pages:
+            text = self.page_text(page)
+            tokens = estimate_tokens(text, self.settings.prompt_chars_per_token)
+            if batch and (len(batch) >= max_pages or used + tokens > budget):
+                batches.append(batch)
+                batch = []
+                used = 0
+            batch.append((page, text))
+            used += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def batch_extraction_messages(self, query, batch):
+        parts = [f'User\'s query: "{query}"']
+        for number, (page, text) in enumerate(batch, 1):
+            parts.append(f"Page {number}:\n{text}")
+        return [
+            {'role': 'system', 'content': BATCH_EXTRACTION_INSTRUCTIONS},
+            {'role': 'user', 'content': "\n\n".join(parts)},
+        ]
+
+def query_generation_messages(query, is_retry=False):
+    hint = QUERY_RETRY_HINT if is_retry else QUERY_GENERAL_HINT
+    return [
+        {'role': 'system', 'content': QUERY_INSTRUCTIONS},
+        {'role': 'user', 'content': f'{hint}\n\nUser\'s query: "{query}"'},
+    ]
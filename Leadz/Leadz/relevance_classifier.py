@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import threading
+
+import numpy as np
+
+from config import CONFIG_DIR
+from settings import get_settings
+
+REJECT = 'reject'
+ESCALATE = 'escalate'
+ACCEPT = 'accept'
+
+VERDICT_LOG_FILE = CONFIG_DIR / 'relevance_verdicts.jsonl'
+MODEL_FILE = CONFIG_DIR / 'relevance_model.json'
+
+def relevance_features(query_embedding, page_embedding, similarity):
+    # With normalised embeddings the element-wise product sums to the cosine
+    # similarity, so a linear model over it can learn which directions of the
+    # embedding space matter for job postings.
+    return np.concatenate(([similarity], query_embedding * page_embedding))
+
+class RelevanceClassifier:
+    # Two-threshold gate in front of the LLM. Pages scoring below reject_below
+    # are dropped without an LLM call, pages above accept_above are analysed
+    # first, and the band in between is escalated to the LLM as capacity allows.
+    # Without a fitted model the score is the raw cosine similarity.
+    def __init__(self, model_file=MODEL_FILE):
+        self.weights = None
+        self.bias = 0.0
+        settings = get_settings()
+        self.reject_below = settings.classifier_reject_below
+        if self.reject_below is None:
+            self.reject_below = settings.similarity_threshold
+        self.accept_above = settings.classifier_accept_above
+        self._load(model_file)
+
+    def _load(self, model_file):
+        if not model_file.exists():
+            return
+        try:
+            with open(model_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.weights = np.asarray(data['weights'], dtype=np.float32)
+            self.bias = float(data['bias'])
+            self.reject_below = float(data['reject_below'])
+            self.accept_above = float(data['accept_above'])
+            print(f"Loaded relevance model trained on {data.get('samples', '?')} verdicts.")
+        except Exception as e:
+            print(f"Relevance model error, using similarity thresholds: {e}")
+            self.weights = None
+
+    def score(self, features):
+        if self.weights is None or len(self.weights) != len(features):
+            return float(features[0])
+        return float(1.0 / (1.0 + np.exp(-(features @ self.weights + self.bias))))
+
+    def classify(self, features):
+        score = self.score(features)
+        if score < self.reject_below:
+            return REJECT, score
+        if score >= self.accept_above:
+            return ACCEPT, score
+        return ESCALATE, score
+
+class VerdictLog:
+    def __init__(self, log_file=VERDICT_LOG_FILE):
+        self.log_file = log_file
+        self._lock = threading.Lock()
+
+    def record(self, query, url, features, is_relevant):
+        entry = {
+            'query': query,
+            'url': url,
+            'features': [round(float(x), 5) for x in features],
+            'relevant': bool(is_relevant),
+        }
+        try:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock, open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+        except Exception as e:
+            print(f"Failed to log relevance verdict: {e}")
+
+def load_verdicts(log_file=VERDICT_LOG_FILE):
+    features, labels = [], []
+    with open(log_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            features.append(entry['features'])
+            labels.append(entry['relevant'])
+    return np.asarray(features, dtype=np.float32), np.asarray(labels, dtype=bool)
+
+def refit(target_recall=0.98, target_precision=0.9, min_samples=50, log_file=VERDICT_LOG_FILE,
+          model_file=MODEL_FILE):
+    from sklearn.linear_model import LogisticRegression
+
+    X, y = load_verdicts(log_file)
+    if len(y) < min_samples or y.all() or not y.any():
+        raise ValueError(f"Need at least {min_samples} verdicts of both classes, have {len(y)} "
+                         f"({int(y.sum())} relevant).")
+
+    model = LogisticRegression(class_weight='balanced', max_iter=1000)
+    model.fit(X, y)
+    scores = model.predict_proba(X)[:, 1]
+
+    # reject_below: the highest score that still lets target_recall of the
+    # relevant pages through to the LLM.
+    positive_scores = np.sort(scores[y])
+    reject_below = float(positive_scores[int(np.floor((1 - target_recall) * len(positive_scores)))])
+
+    # accept_above: the lowest score above which target_precision of the pages
+    # were relevant.
+    accept_above = 1.0
+    for threshold in np.sort(np.unique(scores)):
+        above = scores >= threshold
+        if y[above].mean() >= target_precision:
+            accept_above = float(threshold)
+            break
+    accept_above = max(accept_above, reject_below)
+
+    data = {
+        'weights': model.coef_[0].tolist(),
+        'bias': float(model.intercept_[0]),
+        'reject_below': reject_below,
+        'accept_above': accept_above,
+        'samples': int(len(y)),
+    }
+    with open(model_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+    rejected = scores < reject_below
+    print(f"Fitted on {len(y)} verdicts ({int(y.sum())} relevant).")
+    print(f"  reject_below={reject_below:.3f} accept_above={accept_above:.3f}")
+    print(f"  LLM calls avoided on training data: {rejected.mean():.1%}, "
+          f"relevant pages lost: {int((rejected & y).sum())}")
+    return data
+
+def main():
+    parser = argparse.ArgumentParser(description="Refit the Leadz relevance pre-filter from logged LLM verdicts")
+    parser.add_argument('--target-recall', type=float, default=0.98,
+                        help="fraction of relevant pages that must still reach the LLM")
+    parser.add_argument('--target-precision', type=float, default=0.9,
+                        help="precision required for the 'accept' band")
+    parser.add_argument('--min-samples', type=int, default=50)
+    args = parser.parse_args()
+    refit(args.target_recall, args.target_precision, args.min_samples)
+
+if __name__ == "__main__":
+    main()
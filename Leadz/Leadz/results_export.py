@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import csv
+import json
+from pathlib import Path
+
+from job_record import JobRecord
+
+# Streaming export and import of JobRecords. Writers take one job at a time
+# (as job_found fires) and never hold the result set in memory; readers
+# yield lists of records in chunks so a large export can be loaded back
+# without blocking the UI. pyarrow is only needed for Parquet and is
+# imported when a Parquet file is opened.
+
+EXPORT_COLUMNS = ('jobTitle', 'company', 'location', 'salary', 'salary_min', 'salary_max',
+                  'salary_currency', 'salary_period', 'job_type', 'experience', 'skills',
+                  'summary', 'url', 'similarity', 'found_at', 'search_seconds',
+                  'query', 'search_id')
+FLOAT_COLUMNS = ('salary_min', 'salary_max', 'similarity', 'found_at', 'search_seconds')
+PARQUET_ROW_GROUP = 500
+
+def export_row(job, query=None, search_id=None):
+    return dict(job.to_dict(), query=query, search_id=search_id)
+
+class JsonLinesWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, job, query=None, search_id=None):
+        self.file.write(json.dumps(export_row(job, query, search_id), ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class CsvWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=EXPORT_COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, job, query=None, search_id=None):
+        row = export_row(job, query, search_id)
+        # JSON keeps skills that contain ';' or ',' (e.g. "C#; .NET") intact.
+        row['skills'] = json.dumps(row['skills'], ensure_ascii=False)
+        self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def _parquet_schema(pa):
+    fields = []
+    for column in EXPORT_COLUMNS:
+        if column == 'skills':
+            fields.append(pa.field(column, pa.list_(pa.string())))
+        elif column in FLOAT_COLUMNS:
+            fields.append(pa.field(column, pa.float64()))
+        elif column == 'search_id':
+            fields.append(pa.field(column, pa.int64()))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+class ParquetWriter:
+    # Parquet is columnar, so rows are buffered and written a row group at a
+    # time; close() writes the last partial group.
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.schema = _parquet_schema(pa)
+        self.writer = pq.ParquetWriter(str(path), self.schema)
+        self.rows = []
+
+    def write(self, job, query=None, search_id=None):
+        self.rows.append(export_row(job, query, search_id))
+        if len(self.rows) >= PARQUET_ROW_GROUP:
+            self._flush()
+
+    def _flush(self):
+        if self.rows:
+            self.writer.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+WRITERS = {'.jsonl': JsonLinesWriter, '.json': JsonLinesWriter, '.csv': CsvWriter,
+           '.parquet': ParquetWriter}
+
+def open_writer(path):
+    suffix = Path(path).suffix.lower()
+    if suffix not in WRITERS:
+        raise ValueError(f"Unsupported export format '{suffix}' (use .jsonl, .csv or .parquet)")
+    return WRITERS[suffix](path)
+
+def _chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(JobRecord.from_job(row))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _json_lines(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def _csv_rows(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
+
+def _parquet_rows(path, chunk_size):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet import needs pyarrow (pip install pyarrow)")
+    for batch in pq.ParquetFile(str(path)).iter_batches(batch_size=chunk_size):
+        yield from batch.to_pylist()
+
+def read_jobs(path, chunk_size=200):
+    # Yields lists of up to chunk_size JobRecords.
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.jsonl', '.json'):
+        rows = _json_lines(path)
+    elif suffix == '.csv':
+        rows = _csv_rows(path)
+    elif suffix == '.parquet':
+        rows = _parquet_rows(path, chunk_size)
+    else:
+        raise ValueError(f"Unsupported import format '{suffix}' (use .jsonl, .csv or .parquet)")
+    return _chunks(rows, chunk_size)
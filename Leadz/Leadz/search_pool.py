@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+import heapq
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from settings import get_settings, use_settings
+
+# Searches run in worker processes so several can make progress at once (page
+# fetching, parsing and LLM streaming all hold the GIL at some point). The
+# SentenceTransformer is loaded once, in a separate embedding server process,
+# and workers send it encode requests instead of loading their own copy.
+#
+# Events are (kind, job_id, payload) tuples:
+#   ('queued', job_id, query)       ('started', job_id, query)
+#   ('status', job_id, message)     ('progress', job_id, partial job dict)
+#   ('job', job_id, JobRecord)      ('finished', job_id, jobs found)
+#   ('cancelled', job_id, None)     ('error', None, message)
+# If a worker process dies, its search is reported as an error and finished,
+# and the worker is restarted.
+
+_mp = multiprocessing.get_context('spawn')
+
+EMBED_TIMEOUT = 120 # seconds to wait for the embedding server to answer
+MAX_RESTARTS = 3 # per worker slot and for the embedding server
+
+class RemoteEmbedder:
+    # Stands in for SentenceTransformer inside worker processes.
+    def __init__(self, worker_id, request_queue, response_queue):
+        self.worker_id = worker_id
+        self.request_queue = request_queue
+        self.response_queue = response_queue
+        # The process id keeps a restarted worker from taking answers meant
+        # for the one it replaced.
+        self._request_ids = zip(itertools.repeat(os.getpid()), itertools.count())
+
+    def encode(self, texts, normalize_embeddings=False):
+        request_id = next(self._request_ids)
+        self.request_queue.put((self.worker_id, request_id, list(texts), normalize_embeddings))
+        while True:
+            try:
+                response_id, vectors, error = self.response_queue.get(timeout=EMBED_TIMEOUT)
+            except queue.Empty:
+                raise RuntimeError(f"Embedding server did not answer within {EMBED_TIMEOUT} s")
+            if response_id == request_id:
+                break
+        if error:
+            raise RuntimeError(f"Embedding server error: {error}")
+        return vectors
+
+def _embedding_server_main(settings, request_queue, response_queues, event_queue):
+    use_settings(settings)
+    from search_worker import get_embedding_model
+
+    try:
+        model = get_embedding_model()
+    except Exception as e:
+        event_queue.put(('error', None, f"Could not load embedding model: {e}"))
+        model = None
+
+    while True:
+        request = request_queue.get()
+        if request is None:
+            break
+        worker_id, request_id, texts, normalize = request
+        if model is None:
+            response_queues[worker_id].put((request_id, None, "embedding model not loaded"))
+            continue
+        try:
+            vectors = model.encode(texts, normalize_embeddings=normalize)
+            response_queues[worker_id].put((request_id, vectors, None))
+        except Exception as e:
+            response_queues[worker_id].put((request_id, None, str(e)))
+
+def _worker_main(worker_id, settings, task_queue, event_queue, embed_requests, embed_responses):
+    use_settings(settings)
+    from llm_client import get_llm_client
+    from search_worker import SearchPipeline, import_search_dependencies
+
+    try:
+        import_search_dependencies()
+        get_llm_client().preload()
+    except Exception as e:
+        event_queue.put(('error', None, f"Worker {worker_id} warm-up failed: {e}"))
+
+    embedder = RemoteEmbedder(worker_id, embed_requests, embed_responses)
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        job_id, query = task
+        found = []
+        event_queue.put(('started', job_id, query))
+        pipeline = SearchPipeline(
+            query, embedding_model=embedder,
+            on_status=lambda message: event_queue.put(('status', job_id, message)),
+            on_job=lambda job: (found.append(job), event_queue.put(('job', job_id, job))),
+            on_progress=lambda partial: event_queue.put(('progress', job_id, partial)),
+        )
+        try:
+            pipeline.run()
+        except Exception as e:
+            event_queue.put(('status', job_id, f"An unexpected error occurred: {e}"))
+        event_queue.put(('finished', job_id, len(found)))
+
+class SearchPool:
+    def __init__(self, processes=None, settings=None):
+        self.settings = settings or get_settings()
+        self.processes = max(1, processes or self.settings.search_processes)
+        self.event_queue = _mp.Queue()
+        self.embed_requests = _mp.Queue()
+        self.embed_responses = [_mp.Queue() for _ in range(self.processes)]
+        self._pending = []
+        # Worker slot -> job id it is running (None when idle). Each worker has
+        # its own task queue, so the pool knows which job a dead worker held.
+        self._assigned = {}
+        self._found = {}
+        self._restarts = {}
+        self._synthetic = []
+        self._sequence = itertools.count()
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = None
+        self._workers = {}
+        self._task_queues = {}
+
+    def _start_server(self):
+        self._server = _mp.Process(
+            target=_embedding_server_main, name='leadz-embedding-server', daemon=True,
+            args=(self.settings, self.embed_requests, self.embed_responses, self.event_queue))
+        self._server.start()
+
+    def _start_worker(self, worker_id):
+        # A fresh task queue, so a restarted worker never picks up the task
+        # its predecessor was given.
+        self._task_queues[worker_id] = _mp.Queue()
+        worker = _mp.Process(
+            target=_worker_main, name=f'leadz-search-{worker_id}', daemon=True,
+            args=(worker_id, self.settings, self._task_queues[worker_id], self.event_queue,
+                  self.embed_requests, self.embed_responses[worker_id]))
+        worker.start()
+        self._workers[worker_id] = worker
+        self._assigned[worker_id] = None
+
+    def start(self):
+        self._start_server()
+        for worker_id in range(self.processes):
+            self._start_worker(worker_id)
+
+    def submit(self, query, priority=0, job_id=None):
+        # Higher priority runs first; equal priorities run in submission order.
+        with self._lock:
+            if job_id is None:
+                job_id = next(self._job_ids)
+            self.event_queue.put(('queued', job_id, query))
+            heapq.heappush(self._pending, (-priority, next(self._sequence), job_id, query))
+            self._dispatch()
+        return job_id
+
+    def cancel(self, job_id):
+        with self._lock:
+            for i, entry in enumerate(self._pending):
+                if entry[2] == job_id:
+                    self._pending.pop(i)
+                    heapq.heapify(self._pending)
+                    self.event_queue.put(('cancelled', job_id, None))
+                    return True
+        return False
+
+    def _dispatch(self):
+        # Tasks are handed to a worker only when it is free, so the priority
+        # order is decided here rather than by a FIFO queue.
+        for worker_id, job_id in self._assigned.items():
+            if not self._pending:
+                break
+            if job_id is None and self._workers[worker_id].is_alive():
+                _, _, job_id, query = heapq.heappop(self._pending)
+                self._assigned[worker_id] = job_id
+                self._found[job_id] = 0
+                self._task_queues[worker_id].put((job_id, query))
+
+    def _fail(self, job_id, message):
+        self._synthetic.append(('error', None, message))
+        self._synthetic.append(('finished', job_id, self._found.pop(job_id, 0)))
+
+    def _check_processes(self):
+        # Called with the lock held. Turns the job of a dead worker into
+        # error and finished events so callers waiting for it are released.
+        if not self._workers:
+            return
+        if self._server is not None and not self._server.is_alive():
+            message = f"Embedding server stopped (exit code {self._server.exitcode})"
+            self._server = None
+            if self._restart('server'):
+                self._start_server()
+                message += ", restarted"
+            self._synthetic.append(('error', None, message))
+        for worker_id, worker in list(self._workers.items()):
+            if worker is None or worker.is_alive():
+                continue
+            job_id = self._assigned[worker_id]
+            self._assigned[worker_id] = None
+            self._workers[worker_id] = None
+            message = f"Search process {worker_id} stopped (exit code {worker.exitcode})"
+            if job_id is not None:
+                self._fail(job_id, message)
+            else:
+                self._synthetic.append(('error', None, message))
+            if self._restart(worker_id):
+                self._start_worker(worker_id)
+        if not any(self._workers.values()):
+            while self._pending:
+                _, _, job_id, _ = heapq.heappop(self._pending)
+                self._fail(job_id, "No search processes left to run this search")
+        self._dispatch()
+
+    def _restart(self, key):
+        self._restarts[key] = self._restarts.get(key, 0) + 1
+        return self._restarts[key] <= MAX_RESTARTS
+
+    def get_event(self, timeout=None):
+        with self._lock:
+            self._check_processes()
+            if self._synthetic:
+                return self._synthetic.pop(0)
+        try:
+            event = self.event_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        kind, job_id = event[0], event[1]
+        with self._lock:
+            if kind == 'job' and job_id in self._found:
+                self._found[job_id] += 1
+            elif kind == 'finished':
+                for worker_id, assigned in self._assigned.items():
+                    if assigned == job_id:
+                        self._assigned[worker_id] = None
+                        break
+                else:
+                    # Already reported as finished when its worker died.
+                    return None
+                self._found.pop(job_id, None)
+                self._dispatch()
+        return event
+
+    @property
+    def pending_count(self):
+        return len(self._pending)
+
+    @property
+    def running_count(self):
+        return sum(job_id is not None for job_id in self._assigned.values())
+
+    def is_idle(self):
+        with self._lock:
+            return not self._pending and self.running_count == 0
+
+    def shutdown(self, timeout=5):
+        # A worker in the middle of a search would only read its sentinel
+        # once the search ends, so busy workers are terminated right away.
+        # The rest share one deadline rather than timeout each.
+        processes = []
+        with self._lock:
+            for worker_id, worker in self._workers.items():
+                if worker is None:
+                    continue
+                if self._assigned[worker_id] is not None:
+                    worker.terminate()
+                else:
+                    self._task_queues[worker_id].put(None)
+                processes.append(worker)
+        self.embed_requests.put(None)
+        if self._server is not None:
+            processes.append(self._server)
+        deadline = time.monotonic() + timeout
+        for process in processes:
+            process.join(max(0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+                process.join(1)
+        self._workers = {}
+        self._server = None
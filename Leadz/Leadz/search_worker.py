@@ -1,51 +1,86 @@
 # -*- coding: utf-8 -*-
-import json
 import re 
-import ollama
-import requests
-from bs4 import BeautifulSoup
-from ddgs import DDGS
-
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-
-from PySide6.QtCore import QThread, Signal
-
-from config import (LLM_MODEL, EMBEDDING_MODEL, SEARCH_RESULTS_COUNT, 
-                    TOP_N_PAGES_TO_ANALYZE, SIMILARITY_THRESHOLD)
-
-class JobSearchWorker(QThread):
-    status_update = Signal(str)
-    job_found = Signal(dict)
-    finished = Signal()
-
-    def __init__(self, query):
-        super().__init__()
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from settings import get_settings
+from host_health import BLOCK_STATUSES, get_host_health_registry, host_of
+from job_record import JobRecord
+from job_schema import MISSING, coerce_bool, validate_job
+from json_stream import IncrementalJSONObjectParser, parse_json_lenient
+from llm_client import get_llm_client
+from prompt_builder import PromptBuilder, estimate_tokens, query_generation_messages
+
+# The ML and scraping libraries (torch in particular) take seconds to import, so
+# the GUI process never imports them: searches run in search_pool processes,
+# and only the pool's embedding server loads the SentenceTransformer.
+_embedding_model = None
+_embedding_model_lock = threading.Lock()
+
+# Page embeddings keyed by URL and text, shared by the retry attempt and later
+# searches, which often fetch the same listings again.
+_page_embedding_cache = OrderedDict()
+_page_embedding_cache_lock = threading.Lock()
+
+def import_search_dependencies():
+    import ollama
+    import ddgs
+    import page_fetcher
+    import numpy
+    import relevance_classifier
+
+def get_embedding_model():
+    global _embedding_model
+    with _embedding_model_lock:
+        if _embedding_model is None:
+            from sentence_transformers import SentenceTransformer
+            _embedding_model = SentenceTransformer(get_settings().embedding_model)
+        return _embedding_model
+
+def _ignore(*args):
+    pass
+
+class SearchPipeline:
+    # One search, from query generation to extracted jobs. It has no Qt
+    # dependency so it can run in a search_pool process; progress is reported
+    # through the on_status, on_job and on_progress callbacks.
+    def __init__(self, query, embedding_model=None, on_status=_ignore, on_job=_ignore, on_progress=_ignore):
         self.query = query
-        self.is_running = True
+        self.on_status = on_status
+        self.on_job = on_job
+        self.on_progress = on_progress
+        self.settings = get_settings()
+        self.started_at = None
+        self.embedding_model = embedding_model
+        self.query_embeddings = {}
+        self.llm = get_llm_client()
+        self.session = None
+        self.host_health = get_host_health_registry()
+        self.relevance_classifier = None
+        self.verdict_log = None
+
+    def run(self):
         try:
-            self.embedding_model = SentenceTransformer(EMBEDDING_MODEL)
+            if self.embedding_model is None:
+                self.embedding_model = get_embedding_model()
         except Exception as e:
             print(f"ERROR: Could not load embedding model: {e}")
-            self.status_update.emit(f"Error loading embedding model: {e}")
-            self.is_running = False
-
-    def run(self):
-        if not self.is_running:
-            self.finished.emit()
+            self.on_status(f"Error loading embedding model: {e}")
             return
             
-        max_attempts = 2
+        max_attempts = self.settings.max_search_attempts
         jobs_found_count = 0
         attempt = 1
-        MINIMUM_JOBS_THRESHOLD = 3
+        self.started_at = time.monotonic()
 
         try:
             while attempt <= max_attempts:
                 is_retry = (attempt > 1)
 
                 if is_retry:
-                    self.status_update.emit("Initial search yielded few results. Retrying with a more targeted approach...")
+                    self.on_status("Initial search yielded few results. Retrying with a more targeted approach...")
                     print("\n" + "-"*50)
                     print("RETRYING SEARCH: Using more targeted queries.")
                     print("-"*50)
@@ -54,113 +89,78 @@ class JobSearchWorker(QThread):
                     print(f"Starting search for: '{self.query}'")
                     print("="*50)
 
-                self.status_update.emit("Step 1/5: Generating intelligent search queries...")
+                self.on_status("Step 1/5: Generating intelligent search queries...")
                 search_queries = self._generate_intelligent_search_queries(is_retry=is_retry)
                 if not search_queries:
-                    self.status_update.emit("Error: Could not generate search queries from your request.")
+                    self.on_status("Error: Could not generate search queries from your request.")
                     break 
                 print(f"Step 1 complete: Generated {len(search_queries)} intelligent queries.")
 
-                self.status_update.emit("Step 2/5: Searching the web...")
+                self.on_status("Step 2/5: Searching the web...")
                 search_results = self._conduct_web_search(search_queries)
                 if not search_results:
-                    self.status_update.emit("Error: Web search found no results.")
+                    self.on_status("Error: Web search found no results.")
                     attempt += 1
                     continue
                 print(f"Step 2 complete: Found {len(search_results)} unique URLs.")
 
-                self.status_update.emit("Step 3/5: Fetching pages...")
+                self.on_status("Step 3/5: Fetching pages...")
                 cleaned_pages = self._retrieve_and_clean_pages(search_results)
                 if not cleaned_pages:
-                    self.status_update.emit("Error: Failed to fetch content from websites.")
+                    self.on_status("Error: Failed to fetch content from websites.")
                     attempt += 1
                     continue
                 print(f"Step 3 complete: Cleaned {len(cleaned_pages)} pages.")
 
-                self.status_update.emit("Step 4/5: Ranking & filtering pages...")
-                top_pages = self._rank_retrieved_data(cleaned_pages)
+                self.on_status("Step 4/5: Ranking & filtering pages...")
+                top_pages = self._rank_retrieved_data(cleaned_pages, search_queries)
+                del cleaned_pages
                 if not top_pages:
-                    self.status_update.emit("Could not find relevant pages after filtering.")
+                    self.on_status("Could not find relevant pages after filtering.")
                     attempt += 1
                     continue
                 print(f"Step 4 complete: Selected top {len(top_pages)} relevant pages.")
 
-                self.status_update.emit("Step 5/5: Analyzing job listings for relevance...")
+                self.on_status("Step 5/5: Analyzing job listings for relevance...")
                 found_jobs = self._extract_structured_data(top_pages)
-                for job in found_jobs:
-                    self.job_found.emit(job)
-                    jobs_found_count += 1
+                jobs_found_count += len(found_jobs)
                 print("Step 5 complete.")
 
-                if jobs_found_count >= MINIMUM_JOBS_THRESHOLD or attempt == max_attempts:
+                if jobs_found_count >= self.settings.minimum_jobs_threshold or attempt == max_attempts:
+                    break
+                if self._deadline_passed():
+                    print("Search deadline reached, not retrying.")
                     break
                 
                 attempt += 1
 
         except Exception as e:
             print(f"ERROR: {e}")
-            self.status_update.emit(f"An unexpected error occurred: {e}")
+            self.on_status(f"An unexpected error occurred: {e}")
         finally:
-            self.status_update.emit("Search complete!")
-            self.finished.emit()
+            self.on_status("Search complete!")
             print("="*50)
 
     def _clean_and_parse_json(self, raw_json_string):
-        match = re.search(r'```json\s*(\{.*?\})\s*```', raw_json_string, re.DOTALL)
-        if match:
-            clean_json = match.group(1)
-        else:
-            curly_brace_start = raw_json_string.find('{')
-            curly_brace_end = raw_json_string.rfind('}')
-            if curly_brace_start != -1 and curly_brace_end != -1:
-                clean_json = raw_json_string[curly_brace_start:curly_brace_end+1]
-            else:
-                raise ValueError("No JSON found")
-        return json.loads(clean_json)
+        data, repairs = parse_json_lenient(raw_json_string)
+        if repairs:
+            print(f"  Repaired LLM JSON ({len(repairs)} fixes): {'; '.join(repairs[:8])}")
+        return data
 
     def _generate_intelligent_search_queries(self, is_retry=False):
-        if is_retry:
-            retry_prompt_addon = """
-            The previous broad search attempt yielded insufficient results. 
-            Generate a new set of queries that are more specific. 
-            Focus on constructing queries that explicitly target known job boards and career pages by using the 'site:' operator (e.g., site:linkedin.com, site:greenhouse.io, site:lever.co).
-            Ensure every generated query includes a 'site:' restriction.
-            """
-        else:
-            retry_prompt_addon = """
-            The queries should be suitable for a general web search, like Google or DuckDuckGo.
-            Include synonyms, related technologies, and variations in job titles. Add terms like "careers", "jobs", or "hiring" to improve results.
-            """
-
-        prompt = f"""
-        You are an expert technical recruiter and search specialist.
-        Analyze the following user query and generate a JSON list of 3-5 diverse, high-quality search engine queries to find relevant job postings online.
-        Infer the job title, key skills, location, and experience level from the user's query.
-        {retry_prompt_addon}
-
-        User's query: "{self.query}"
-
-        Example output for a query like "Senior Python Developer, Remote, New York":
-        {{
-            "queries": [
-                "senior python developer remote jobs new york",
-                "python backend engineer careers nyc remote",
-                "lead software developer python django hiring remote",
-                "remote senior backend developer jobs (python or django) united states"
-            ]
-        }}
-
-        Respond ONLY with the JSON object containing the "queries" list.
-        """
+        messages = query_generation_messages(self.query, is_retry)
         try:
-            response = ollama.chat(model=LLM_MODEL, messages=[{'role': 'user', 'content': prompt}], format="json")
-            data = self._clean_and_parse_json(response['message']['content'])
-            return data.get("queries", [])
+            content = self.llm.chat(messages, format="json")
+            data = self._clean_and_parse_json(content)
+            queries = data.get("queries", []) if isinstance(data, dict) else data
+            return [q for q in queries if isinstance(q, str) and q.strip()]
         except Exception as e:
             print(f"Error generating intelligent queries: {e}")
             return []
 
     def _conduct_web_search(self, search_queries):
+        from ddgs import DDGS
+
         all_results = []
         seen_urls = set()
         site_restriction = "(site:linkedin.com OR site:indeed.com OR site:glassdoor.com OR site:greenhouse.io OR site:lever.co OR site:wellfound.com)"
@@ -171,7 +171,8 @@ class JobSearchWorker(QThread):
             if "site:" not in q:
                 num_queries_to_run +=1
 
-        results_per_search = max(1, SEARCH_RESULTS_COUNT // num_queries_to_run if num_queries_to_run > 0 else SEARCH_RESULTS_COUNT)
+        results_count = self.settings.search_results_count
+        results_per_search = max(1, results_count // num_queries_to_run if num_queries_to_run > 0 else results_count)
 
         def perform_search(query):
             try:
@@ -191,88 +192,301 @@ class JobSearchWorker(QThread):
             if "site:" not in query:
                 final_query = f"{query} {site_restriction}"
                 perform_search(final_query)
-        
-        return all_results
+
+        # Skip hosts whose circuit breaker is open and fetch the hosts that
+        # have yielded jobs before first. Hosts that rarely yield jobs keep
+        # one URL per search, which is enough to notice if they improve, and
+        # the lowest-priority URLs beyond search_results_count are dropped,
+        # so neither takes fetch slots from better hosts.
+        results = [r for r in all_results if not self.host_health.is_open(r['href'])]
+        if len(results) < len(all_results):
+            print(f"Dropped {len(all_results) - len(results)} URLs from hosts with an open circuit breaker.")
+        results.sort(key=lambda r: self.host_health.priority(r['href']), reverse=True)
+        kept = []
+        probed = set()
+        for r in results:
+            if self.host_health.is_low_yield(r['href']):
+                host = host_of(r['href'])
+                if host in probed:
+                    continue
+                probed.add(host)
+            kept.append(r)
+        kept = kept[:results_count]
+        if len(kept) < len(results):
+            print(f"Dropped {len(results) - len(kept)} URLs from low-yield hosts or beyond the result count.")
+        return kept
 
     def _retrieve_and_clean_pages(self, search_results):
-        pages = []
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        for result in search_results:
-            url = result['href']
-            try:
-                response = requests.get(url, headers=headers, timeout=7)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-                for tag in soup(["script", "style", "nav", "footer", "header", "aside"]):
-                    tag.extract()
-                text = soup.get_text(separator=' ', strip=True)
-                if len(text) > 300:
-                    pages.append({'url': url, 'text': text})
-            except:
-                pass 
+        from page_fetcher import create_session
+
+        if self.session is None:
+            self.session = create_session()
+
+        urls = [result['href'] for result in search_results]
+        concurrency = max(1, self.settings.fetch_concurrency)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pages = [page for page in executor.map(self._fetch_page, urls) if page is not None]
+        self.host_health.save()
         return pages
 
-    def _rank_retrieved_data(self, pages):
+    def _get_query_matrix(self, search_queries):
+        # The user query plus every generated query, embedded once per search
+        # and reused by the retry attempt. site: filters and boolean operators
+        # only matter to the search engine, so they are stripped before encoding.
+        import numpy as np
+
+        texts = [self.query]
+        if self.settings.ranking_use_generated_queries:
+            for q in search_queries:
+                text = re.sub(r'\(?site:\S+\)?|\bOR\b|[()]', ' ', q)
+                text = ' '.join(text.split())
+                if text and text not in texts:
+                    texts.append(text)
+
+        missing = [t for t in texts if t not in self.query_embeddings]
+        if missing:
+            for text, vector in zip(missing, self.embedding_model.encode(missing, normalize_embeddings=True)):
+                self.query_embeddings[text] = vector
+        return np.stack([self.query_embeddings[t] for t in texts])
+
+    def _encode_pages(self, pages):
+        import numpy as np
+
+        cache_size = self.settings.embedding_cache_size
+        keys = [(page.url, hash(page.text)) for page in pages]
+        with _page_embedding_cache_lock:
+            cached = [_page_embedding_cache.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        if missing:
+            vectors = self.embedding_model.encode([pages[i].text for i in missing], normalize_embeddings=True)
+            for i, vector in zip(missing, vectors):
+                cached[i] = vector
+        if cache_size > 0:
+            with _page_embedding_cache_lock:
+                for key, vector in zip(keys, cached):
+                    _page_embedding_cache[key] = vector
+                    _page_embedding_cache.move_to_end(key)
+                while len(_page_embedding_cache) > cache_size:
+                    _page_embedding_cache.popitem(last=False)
+        return np.stack(cached)
+
+    def _deadline_passed(self):
+        deadline = self.settings.search_deadline
+        return bool(deadline) and time.monotonic() - self.started_at > deadline
+
+    def _fetch_page(self, url):
+        import requests
+        from page_fetcher import UnsupportedContent, fetch_page
+
+        if self._deadline_passed():
+            return None
+        if self.host_health.is_open(url):
+            print(f"  Skipping {url}: host circuit breaker is open")
+            return None
+        start = time.perf_counter()
+        try:
+            page = fetch_page(self.session, url, timeout=self.host_health.timeout_for(url))
+            self.host_health.record_success(url, time.perf_counter() - start)
+            if len(page.text) > 300:
+                return page
+        except UnsupportedContent as e:
+            self.host_health.record_success(url, time.perf_counter() - start)
+            print(f"  Skipping {url}: {e}")
+        except requests.Timeout:
+            self.host_health.record_failure(url, 'timeout')
+            print(f"  Timed out fetching {url}")
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status in BLOCK_STATUSES:
+                self.host_health.record_failure(url, 'blocked', status)
+            elif status is not None and status < 500:
+                # A missing page is not the host's fault.
+                self.host_health.record_success(url, time.perf_counter() - start, status)
+            else:
+                self.host_health.record_failure(url, 'http_error', status)
+            print(f"  HTTP {status} fetching {url}")
+        except requests.RequestException as e:
+            self.host_health.record_failure(url, 'error')
+            print(f"  Failed to fetch {url}: {type(e).__name__}")
+        except Exception as e:
+            print(f"  Failed to parse {url}: {e}")
+        return None
+
+    def _rank_retrieved_data(self, pages, search_queries=()):
         if not pages: 
             return []
-        page_texts = [page['text'] for page in pages]
-        query_embedding = self.embedding_model.encode([self.query])
-        page_embeddings = self.embedding_model.encode(page_texts)
-        similarities = cosine_similarity(query_embedding, page_embeddings)[0]
+
+        query_matrix = self._get_query_matrix(search_queries)
+        page_embeddings = self._encode_pages(pages)
+
+        # Embeddings are normalised, so one matrix multiply gives the cosine
+        # similarity of every page to every query.
+        query_scores = page_embeddings @ query_matrix.T
+        if query_matrix.shape[0] == 1:
+            similarities = query_scores[:, 0]
+        elif self.settings.ranking_mode == 'weighted':
+            weight = self.settings.user_query_weight
+            similarities = (weight * query_scores[:, 0]
+                            + (1 - weight) * query_scores[:, 1:].mean(axis=1))
+        else:
+            similarities = query_scores.max(axis=1)
+
+        for page, similarity in zip(pages, similarities):
+            page.similarity = float(similarity)
+
+        if self.settings.relevance_classifier_enabled:
+            return self._classify_pages(pages, query_matrix[0], page_embeddings, similarities)
         
         ranked_pages = sorted(zip(pages, similarities), key=lambda x: x[1], reverse=True)
         
         relevant_pages = []
         for page, score in ranked_pages:
-            if score >= SIMILARITY_THRESHOLD:
+            if score >= self.settings.similarity_threshold:
                 relevant_pages.append(page)
 
-        return relevant_pages[:TOP_N_PAGES_TO_ANALYZE]
+        return relevant_pages[:self.settings.top_n_pages_to_analyze]
+
+    def _classify_pages(self, pages, query_embedding, page_embeddings, similarities):
+        from relevance_classifier import ACCEPT, REJECT, relevance_features
+
+        if self.relevance_classifier is None:
+            from relevance_classifier import RelevanceClassifier, VerdictLog
+            self.relevance_classifier = RelevanceClassifier()
+            self.verdict_log = VerdictLog()
+
+        accepted, escalated = [], []
+        rejected_count = 0
+        for page, page_embedding, similarity in zip(pages, page_embeddings, similarities):
+            features = relevance_features(query_embedding, page_embedding, similarity)
+            verdict, score = self.relevance_classifier.classify(features)
+            if verdict == REJECT:
+                rejected_count += 1
+                continue
+            page.relevance_features = features
+            (accepted if verdict == ACCEPT else escalated).append((page, score))
+
+        print(f"  Pre-filter: {len(accepted)} accepted, {len(escalated)} escalated, "
+              f"{rejected_count} rejected without an LLM call.")
+        accepted.sort(key=lambda x: x[1], reverse=True)
+        escalated.sort(key=lambda x: x[1], reverse=True)
+        return [page for page, _ in accepted + escalated][:self.settings.top_n_pages_to_analyze]
 
     def _extract_structured_data(self, top_pages):
         found_jobs = []
-        for i, page in enumerate(top_pages):
-            self.status_update.emit(f"Step 5/5: Analyzing job {i+1}/{len(top_pages)} for relevance...")
-            
-            prompt = f"""
-            The user is searching for a job with this query: "{self.query}"
-
-            Analyze the text below. First, determine if it contains a job posting highly relevant to the user's query.
-            - If NO relevant job is found, respond ONLY with the JSON: {{"is_relevant": false}}
-            - If a relevant job IS found, extract its details into the following JSON structure. 
-            - Use "N/A" for any missing fields.
-            - The 'skills' field should be a list of 3-5 key technologies or qualifications.
-            - The 'summary' field should be 2-3 sentences.
-
-            {{
-                "is_relevant": true,
-                "jobTitle": "...",
-                "company": "...",
-                "location": "...",
-                "salary": "...",
-                "job_type": "Full-time | Part-time | Contract | N/A",
-                "experience": "Entry-level | Mid-level | Senior | N/A",
-                "skills": ["...", "...", "..."],
-                "summary": "..."
-            }}
-
-            Respond ONLY with the JSON object.
-
-            Text: ---
-            {page['text'][:4000]}
-            ---
-            """
-            try:
-                response = ollama.chat(model=LLM_MODEL, messages=[{'role': 'user', 'content': prompt}], format="json")
-                job_data = self._clean_and_parse_json(response['message']['content'])
+        builder = PromptBuilder(self.settings)
+        builder.observe(top_pages)
+        done = 0
+        for batch in builder.batches(top_pages):
+            if self._deadline_passed():
+                print(f"Search deadline reached, skipping {len(top_pages) - done} remaining pages.")
+                break
+            if len(batch) == 1:
+                self.on_status(f"Step 5/5: Analyzing job {done+1}/{len(top_pages)} for relevance...")
+                results = [None]
+            else:
+                self.on_status(f"Step 5/5: Analyzing jobs {done+1}-{done+len(batch)}/{len(top_pages)} for relevance...")
+                results = self._extract_batch(builder, batch)
+            done += len(batch)
+
+            for (page, text), job_data in zip(batch, results):
+                if job_data is None:
+                    job_data = self._extract_page(builder, page, text)
+                    if job_data is None:
+                        continue
+                try:
+                    job_data, recovered = validate_job(job_data)
+                except ValueError as e:
+                    print(f"Invalid extraction result for {page.url}: {e}")
+                    continue
+                if recovered:
+                    print(f"  Recovered fields for {page.url}: {'; '.join(recovered)}")
+
+                if self.verdict_log is not None and page.relevance_features is not None:
+                    self.verdict_log.record(self.query, page.url, page.relevance_features,
+                                            job_data.get('is_relevant'))
+
+                self.host_health.record_yield(page.url, bool(job_data.get('is_relevant')))
 
                 if job_data.get('is_relevant'):
-                    job_data['url'] = page['url']
-                    found_jobs.append(job_data)
-                    print(f"  -> Found relevant job: {job_data.get('jobTitle')}")
+                    elapsed = round(time.monotonic() - self.started_at, 2) if self.started_at else None
+                    job = JobRecord.from_job(job_data, url=page.url, similarity=page.similarity,
+                                             found_at=time.time(), search_seconds=elapsed)
+                    found_jobs.append(job)
+                    self.on_job(job)
+                    print(f"  -> Found relevant job: {job.title}")
                 else:
-                    print(f"  -> Skipping irrelevant content on {page['url']}")
+                    print(f"  -> Skipping irrelevant content on {page.url}")
+        self.host_health.save()
+        return found_jobs
 
-            except Exception as e:
-                print(f"Error extracting data from {page['url']}: {e}")
-        return found_jobs
\ No newline at end of file
+    def _extract_page(self, builder, page, text):
+        try:
+            messages = builder.extraction_messages(self.query, page, text)
+            print(f"  Prompt for {page.url}: ~{estimate_tokens(messages[1]['content'])} tokens "
+                  f"(page text ~{estimate_tokens(page.text)})")
+            if self.settings.stream_extraction:
+                return self._stream_extraction(messages, page.url)
+            return self._clean_and_parse_json(self.llm.chat(messages, format="json"))
+        except Exception as e:
+            print(f"Error extracting data from {page.url}: {e}")
+            return None
+
+    def _extract_batch(self, builder, batch):
+        # One call for several pages. Items that are missing or malformed come
+        # back as None and those pages are retried one at a time.
+        results = [None] * len(batch)
+        messages = builder.batch_extraction_messages(self.query, batch)
+        print(f"  Batched prompt for {len(batch)} pages: ~{estimate_tokens(messages[1]['content'])} tokens")
+        try:
+            data = self._clean_and_parse_json(self.llm.chat(messages, format="json"))
+        except Exception as e:
+            print(f"Error in batched extraction, falling back to single pages: {e}")
+            return results
+        items = data.get('results') if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            print("Batched extraction returned no results list, falling back to single pages.")
+            return results
+
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            number = item.pop('page', None)
+            if number is None and len(items) == len(batch):
+                number = position + 1
+            if not isinstance(number, int) or not 1 <= number <= len(batch) or results[number - 1] is not None:
+                continue
+            try:
+                job, _ = validate_job(item)
+            except ValueError:
+                continue
+            if job['is_relevant'] and job['jobTitle'] == MISSING:
+                continue
+            results[number - 1] = job
+        missing = results.count(None)
+        if missing:
+            print(f"  {missing}/{len(batch)} batched results invalid, retrying those pages singly.")
+        return results
+
+    def _stream_extraction(self, messages, url):
+        # is_relevant is the first key of the schema, so for the (common)
+        # irrelevant pages generation can be stopped after a few tokens.
+        parser = IncrementalJSONObjectParser()
+        stream = self.llm.stream_chat(messages, format="json")
+        try:
+            for chunk in stream:
+                for key, value in parser.feed(chunk):
+                    # Models sometimes write "false" or "no"; validate_job
+                    # would read those as irrelevant too.
+                    if key == 'is_relevant' and coerce_bool(value) is False:
+                        print(f"  -> Relevance gate closed after {len(parser.text)} chars")
+                        return {'is_relevant': False}
+                    if key != 'is_relevant' and coerce_bool(parser.fields.get('is_relevant')):
+                        self.on_progress(dict(parser.fields, url=url))
+                if parser.done:
+                    break
+        finally:
+            stream.close()
+
+        if parser.done:
+            return parser.fields
+        return self._clean_and_parse_json(parser.text)
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import os
+import threading
+
+import config
+
+# Runtime settings are resolved from these layers, later ones winning:
+#   1. defaults: the upper-case constants in config.py
+#   2. the selected performance profile (PROFILES)
+#   3. ~/.job_llama/settings.json (shared with ThemeManager)
+#   4. LEADZ_* environment variables, e.g. LEADZ_FETCH_CONCURRENCY=8
+#   5. command-line flags, e.g. --fetch-concurrency 8 or --profile fast
+# The profile itself can be chosen in any of layers 3-5.
+
+SETTINGS_FILE = config.CONFIG_DIR / 'settings.json'
+ENV_PREFIX = 'LEADZ_'
+NOT_SETTINGS = ('THEMES', 'CONFIG_DIR', 'DEFAULT_PROFILE')
+
+DEFAULTS = {name.lower(): value for name, value in vars(config).items()
+            if name.isupper() and name not in NOT_SETTINGS}
+
+PROFILES = {
+    'fast': {
+        'search_results_count': 12,
+        'top_n_pages_to_analyze': 4,
+        'max_search_attempts': 1,
+        'fetch_timeout': 4,
+        'fetch_concurrency': 8,
+        'max_page_bytes': 500_000,
+        'search_deadline': 90,
+        'extraction_batch_size': 4,
+    },
+    'balanced': {},
+    'thorough': {
+        'search_results_count': 50,
+        'top_n_pages_to_analyze': 16,
+        'minimum_jobs_threshold': 6,
+        'similarity_threshold': 0.35,
+        'fetch_timeout': 12,
+        'fetch_concurrency': 8,
+        'search_deadline': 0,
+    },
+}
+
+# Integer settings that are durations or ratios and may be fractional. All
+# other integer settings are counts or sizes used as indices and must be
+# whole numbers.
+FRACTIONAL_SETTINGS = ('search_deadline', 'fetch_timeout', 'min_fetch_timeout',
+                       'circuit_breaker_cooldown', 'prompt_chars_per_token')
+
+def _number(key, value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value) if any(c in value for c in '.eEn') else int(value)
+        except ValueError:
+            pass
+    raise ValueError(f"{key} expects a number, got {value!r}")
+
+def _coerce(key, value):
+    # Values from settings.json keep their JSON types; environment variables
+    # and flags are strings. Either way the result has the default's type.
+    default = DEFAULTS[key]
+    if isinstance(default, str):
+        return value
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            if value.lower() in ('1', 'true', 'yes', 'on'):
+                return True
+            if value.lower() in ('0', 'false', 'no', 'off'):
+                return False
+        raise ValueError(f"{key} expects a boolean, got {value!r}")
+    if isinstance(default, int):
+        number = _number(key, value)
+        if float(number).is_integer():
+            return int(number)
+        if key in FRACTIONAL_SETTINGS:
+            return number
+        raise ValueError(f"{key} expects a whole number, got {value!r}")
+    if isinstance(default, float):
+        return float(_number(key, value))
+    if not isinstance(value, str):
+        return value
+    if value.lower() in ('', 'none'):
+        return None
+    # Optional settings (default None) are either numbers or free text.
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+class Settings:
+    def __init__(self, values, sources, profile):
+        self.__dict__.update(values)
+        self.sources = sources
+        self.profile = profile
+
+    def describe(self):
+        lines = [f"profile: {self.profile}"]
+        for key in sorted(DEFAULTS):
+            lines.append(f"{key} = {getattr(self, key)!r} ({self.sources[key]})")
+        return "\n".join(lines)
+
+def read_settings_file(path=SETTINGS_FILE, strict=False):
+    # The file is edited by hand, so a file that does not parse is reported
+    # and ignored but never replaced. strict=True raises instead, for callers
+    # that are about to write the file back.
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object")
+        return data
+    except Exception as e:
+        if strict:
+            raise
+        print(f"Settings file error in {path}: {e}")
+        return {}
+
+def _file_layer(path):
+    layer = {}
+    for key, value in read_settings_file(path).items():
+        if key == 'profile' or key in DEFAULTS:
+            layer[key] = value
+        elif key != 'theme':
+            print(f"Warning: unknown setting '{key}' in {path}")
+    return layer
+
+def _env_layer():
+    layer = {}
+    for key in list(DEFAULTS) + ['profile']:
+        value = os.environ.get(ENV_PREFIX + key.upper())
+        if value is not None:
+            layer[key] = value
+    return layer
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--profile', choices=sorted(PROFILES))
+    parser.add_argument('--show-settings', action='store_true')
+    for key in sorted(DEFAULTS):
+        parser.add_argument('--' + key.replace('_', '-'), dest=key, metavar='VALUE')
+    return parser
+
+def _cli_layer(argv):
+    if argv is None:
+        return {}, False
+    args, _ = build_arg_parser().parse_known_args(argv)
+    layer = {key: value for key, value in vars(args).items()
+             if value is not None and key != 'show_settings'}
+    return layer, args.show_settings
+
+def load_settings(argv=None, path=SETTINGS_FILE):
+    cli, show = _cli_layer(argv)
+    layers = [('settings.json', _file_layer(path)), ('environment', _env_layer()), ('command line', cli)]
+
+    profile = config.DEFAULT_PROFILE
+    for _, layer in layers:
+        profile = layer.get('profile', profile)
+    if profile not in PROFILES:
+        print(f"Warning: unknown profile '{profile}', using '{config.DEFAULT_PROFILE}'")
+        profile = config.DEFAULT_PROFILE
+
+    values = dict(DEFAULTS)
+    sources = dict.fromkeys(DEFAULTS, 'default')
+    for key, value in PROFILES[profile].items():
+        values[key] = value
+        sources[key] = f"profile {profile}"
+    for name, layer in layers:
+        for key, value in layer.items():
+            if key == 'profile':
+                continue
+            try:
+                values[key] = _coerce(key, value)
+                sources[key] = name
+            except ValueError as e:
+                print(f"Warning: ignoring {name} setting: {e}")
+
+    settings = Settings(values, sources, profile)
+    if show:
+        print(settings.describe())
+    return settings
+
+_settings = None
+_settings_lock = threading.Lock()
+
+def init_settings(argv=None):
+    global _settings
+    with _settings_lock:
+        _settings = load_settings(argv)
+        return _settings
+
+def use_settings(settings):
+    # Used by search_pool processes to run with the parent's resolved settings.
+    global _settings
+    with _settings_lock:
+        _settings = settings
+
+def get_settings():
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = load_settings()
+        return _settings
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that must never be imported before the window is shown.
+DEFERRED_MODULES = ('torch', 'sentence_transformers', 'transformers', 'sklearn',
+                    'numpy', 'ollama', 'bs4', 'ddgs', 'requests')
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def measure_import_time(module='main_window'):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=APP_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing '{module}' failed:\n{result.stderr}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({
+                'module': name,
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us),
+                'top_level': len(indent) <= 1,
+            })
+    return entries
+
+def measure_first_paint():
+    result = subprocess.run(
+        [sys.executable, 'Leadz.py', '--startup-benchmark'],
+        cwd=APP_DIR, capture_output=True, text=True, timeout=120
+    )
+    match = re.search(r'first_paint_ms=([\d.]+)', result.stdout)
+    if not match:
+        raise RuntimeError(f"Could not measure first paint:\n{result.stdout}\n{result.stderr}")
+    return float(match.group(1))
+
+def main():
+    parser = argparse.ArgumentParser(description="Leadz startup time benchmark")
+    parser.add_argument('--import-budget-ms', type=float, default=1500.0,
+                        help="maximum time to import main_window")
+    parser.add_argument('--paint-budget-ms', type=float, default=3000.0,
+                        help="maximum time from process start to the first paint")
+    parser.add_argument('--skip-paint', action='store_true',
+                        help="only measure imports (e.g. on headless machines)")
+    parser.add_argument('--top', type=int, default=15,
+                        help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    failures = []
+    entries = measure_import_time()
+    total_ms = sum(e['cumulative_us'] for e in entries if e['top_level']) / 1000
+
+    print(f"Startup imports (interpreter + main_window): {total_ms:.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    print(f"Slowest {args.top} imports (cumulative):")
+    for e in sorted(entries, key=lambda e: e['cumulative_us'], reverse=True)[:args.top]:
+        print(f"  {e['cumulative_us'] / 1000:9.1f} ms  {e['module']}")
+
+    if total_ms > args.import_budget_ms:
+        failures.append(f"import time {total_ms:.1f} ms exceeds budget of {args.import_budget_ms:.0f} ms")
+
+    eager = sorted({e['module'] for e in entries if e['module'].split('.')[0] in DEFERRED_MODULES})
+    if eager:
+        failures.append("deferred modules imported at startup: " + ", ".join(eager))
+
+    if not args.skip_paint:
+        paint_ms = measure_first_paint()
+        print(f"Time to first paint: {paint_ms:.1f} ms (budget {args.paint_budget_ms:.0f} ms)")
+        if paint_ms > args.paint_budget_ms:
+            failures.append(f"first paint {paint_ms:.1f} ms exceeds budget of {args.paint_budget_ms:.0f} ms")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: startup is within budget.")
+
+if __name__ == "__main__":
+    main()
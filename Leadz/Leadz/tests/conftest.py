@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+import sys
+from pathlib import Path
+
+# The modules live flat next to Leadz.py and import each other by name.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
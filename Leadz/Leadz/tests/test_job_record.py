@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from job_record import JobRecord, parse_salary
+
+@pytest.mark.parametrize('text, expected', [
+    ("$100,000 - $120,000", (100000, 120000, 'USD', 'year')),
+    ("€60k–80k per year", (60000, 80000, 'EUR', 'year')),
+    ("$45/hr", (45, 45, 'USD', 'hour')),
+    ("$20-25 hourly", (20, 25, 'USD', 'hour')),
+    ("£400 per day", (400, 400, 'GBP', 'day')),
+    ("60-80k", (60000, 80000, None, 'year')),
+    ("70.000 EUR pro Jahr", (70000, 70000, 'EUR', 'year')),
+    ("90k CAD", (90000, 90000, 'CAD', 'year')),
+    ("85,000", (85000, 85000, None, 'year')),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == expected
+
+@pytest.mark.parametrize('text, expected', [
+    ("$120,000 + 10% bonus", (120000, 120000, 'USD', 'year')),
+    ("2 years experience, $90,000", (90000, 90000, 'USD', 'year')),
+    ("Up to $150,000 plus 401k", (150000, 150000, 'USD', 'year')),
+    ("£30,000 - £35,000 pro rata, 3 days a week", (30000, 35000, 'GBP', 'year')),
+    ("37.5 hours/week, £28,000", (28000, 28000, 'GBP', 'year')),
+])
+def test_parse_salary_ignores_numbers_that_are_not_pay(text, expected):
+    assert parse_salary(text) == expected
+
+@pytest.mark.parametrize('text', ["N/A", "Competitive", "2-3 years", "Academic scale 50,000", ""])
+def test_parse_salary_without_amount(text):
+    assert parse_salary(text) == (None, None, None, None)
+
+def test_annual_salary():
+    job = JobRecord("Developer", salary="$40-50/hr")
+    assert job.annual_salary() == (40 * 2080, 50 * 2080)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from job_schema import MISSING, validate_job
+
+def test_complete_job_needs_no_recovery():
+    data = {'is_relevant': True, 'jobTitle': 'Engineer', 'company': 'Acme', 'location': 'Remote',
+            'salary': '$100k', 'job_type': 'Full-time', 'experience': 'Senior',
+            'skills': ['Python'], 'summary': 'Builds things.'}
+    assert validate_job(data) == (data, [])
+
+def test_irrelevant_job_drops_other_fields():
+    assert validate_job({'is_relevant': 'no', 'jobTitle': 'x'}) == (
+        {'is_relevant': False}, ["is_relevant: converted 'no'"])
+
+def test_coerces_fields():
+    job, recovered = validate_job({'is_relevant': 'true', 'jobTitle': 'Engineer', 'salary': 90000,
+                                   'skills': 'Python, SQL; Docker', 'location': ['Berlin', 'Remote']})
+    assert job['is_relevant'] is True
+    assert job['salary'] == '90000'
+    assert job['skills'] == ['Python', 'SQL', 'Docker']
+    assert job['location'] == 'Berlin, Remote'
+    assert job['company'] == MISSING
+    assert "company: missing" in recovered
+    assert "skills: converted str to list" in recovered
+    assert "salary: converted int to text" in recovered
+
+@pytest.mark.parametrize('data', [[{'is_relevant': True}], {'jobTitle': 'x'}, {'is_relevant': 'maybe'}])
+def test_rejects_undecidable_relevance(data):
+    with pytest.raises(ValueError):
+        validate_job(data)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from json_stream import IncrementalJSONObjectParser, parse_json_lenient
+
+def test_well_formed_output_has_no_repairs():
+    text = '```json\n{"is_relevant": true, "skills": ["Python", "SQL"]}\n```'
+    assert parse_json_lenient(text) == ({'is_relevant': True, 'skills': ['Python', 'SQL']}, [])
+
+@pytest.mark.parametrize('text, expected, repair', [
+    ('{"a": 1, "b": [1, 2,],}', {'a': 1, 'b': [1, 2]}, "trailing comma"),
+    ('{"a": "x" "b": 1}', {'a': 'x', 'b': 1}, "missing ',' before 'b'"),
+    ('{"a": [1 2]}', {'a': [1, 2]}, "missing ',' before item 1"),
+    ('{jobTitle: "Engineer"}', {'jobTitle': 'Engineer'}, "unquoted key 'jobTitle'"),
+    ('{"company": Acme Corp}', {'company': 'Acme Corp'}, "unquoted value"),
+    ("{'a': 'it\\'s'}", {'a': "it's"}, "single-quoted string"),
+    ('{"is_relevant": True, "salary": None}', {'is_relevant': True, 'salary': None}, "Python literal True"),
+    ('{"a": 01, "b": -007.5}', {'a': 1, 'b': -7.5}, "leading zeros in 01"),
+    ('{"summary": "cut off', {'summary': 'cut off'}, "truncated string"),
+    ('{"skills": ["Go", "Rust"', {'skills': ['Go', 'Rust']}, "truncated array"),
+    ('{"a": 1, "b": {"c": 2', {'a': 1, 'b': {'c': 2}}, "truncated object"),
+])
+def test_repairs(text, expected, repair):
+    value, repairs = parse_json_lenient(text)
+    assert value == expected
+    assert any(repair in r for r in repairs), repairs
+
+def test_repairs_report_key_path():
+    _, repairs = parse_json_lenient('{"job": {"skills": ["a" "b"]}}')
+    assert repairs == ["job.skills: missing ',' before item 1"]
+
+def test_prefers_object_over_earlier_array():
+    assert parse_json_lenient('Note [1]: {"is_relevant": false}') == ({'is_relevant': False}, [])
+
+def test_array_without_object():
+    assert parse_json_lenient('Results: [1, 2]') == ([1, 2], [])
+
+def test_no_json():
+    with pytest.raises(ValueError):
+        parse_json_lenient("I cannot help with that.")
+
+def _feed(text, chunk_size=3):
+    parser = IncrementalJSONObjectParser()
+    completed = []
+    for i in range(0, len(text), chunk_size):
+        completed += parser.feed(text[i:i + chunk_size])
+    return parser, completed
+
+def test_incremental_reports_fields_as_they_complete():
+    parser = IncrementalJSONObjectParser()
+    assert parser.feed('```json\n{"is_relevant": fal') == []
+    assert parser.feed('se, "jobTitle"') == [('is_relevant', False)]
+    assert not parser.done
+
+def test_incremental_nested_values_and_strings():
+    parser, completed = _feed('{"is_relevant": true, "skills": ["a, b", "{c}"], "summary": "x: \\"y\\""}')
+    assert parser.done
+    assert completed == [('is_relevant', True), ('skills', ['a, b', '{c}']), ('summary', 'x: "y"')]
+
+def test_incremental_lenient_values():
+    parser, _ = _feed("{'is_relevant': True, 'company': Acme, 'count': 01}")
+    assert parser.fields == {'is_relevant': True, 'company': 'Acme', 'count': 1}
+
+def test_incremental_missing_comma():
+    parser, _ = _feed('{"is_relevant": true "jobTitle": "Engineer"}')
+    assert parser.fields == {'is_relevant': True, 'jobTitle': 'Engineer'}
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from job_record import JobRecord
+from results_export import PARQUET_ROW_GROUP, open_writer, read_jobs
+
+def _jobs(count):
+    return [JobRecord(f"Developer {i}", company="Acme", salary="$90k-100k", skills=["C#; .NET", "SQL, T-SQL"],
+                      url=f"https://example.com/{i}", similarity=0.5, found_at=1.0, search_seconds=2.5)
+            for i in range(count)]
+
+@pytest.mark.parametrize('suffix', ['.jsonl', '.csv', '.parquet'])
+def test_round_trip(tmp_path, suffix):
+    if suffix == '.parquet':
+        pytest.importorskip('pyarrow')
+    jobs = _jobs(PARQUET_ROW_GROUP + 7)
+    path = tmp_path / f"results{suffix}"
+    writer = open_writer(path)
+    for job in jobs:
+        writer.write(job, query="developer", search_id=1)
+    writer.close()
+    loaded = [job for chunk in read_jobs(path, chunk_size=100) for job in chunk]
+    assert [job.to_dict() for job in loaded] == [job.to_dict() for job in jobs]
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError):
+        open_writer(tmp_path / "results.xlsx")
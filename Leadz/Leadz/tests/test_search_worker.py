@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from search_worker import SearchPipeline
+
+class FakeLLM:
+    def __init__(self, text):
+        self.text = text
+        self.closed_at = None
+
+    def stream_chat(self, messages, format="json"):
+        sent = 0
+        try:
+            for i in range(0, len(self.text), 4):
+                sent = i + 4
+                yield self.text[i:sent]
+        finally:
+            self.closed_at = sent
+
+def _pipeline(text):
+    pipeline = SearchPipeline.__new__(SearchPipeline)
+    pipeline.llm = FakeLLM(text)
+    pipeline.progress = []
+    pipeline.on_progress = pipeline.progress.append
+    return pipeline
+
+@pytest.mark.parametrize('verdict', ['false', '"false"', '"no"', "'No'"])
+def test_relevance_gate_closes_on_malformed_false(verdict):
+    text = '{"is_relevant": ' + verdict + ', "jobTitle": "' + 'x' * 200 + '"}'
+    pipeline = _pipeline(text)
+    assert pipeline._stream_extraction([], 'https://example.com') == {'is_relevant': False}
+    assert pipeline.llm.closed_at < 60
+    assert pipeline.progress == []
+
+def test_progress_for_string_true():
+    pipeline = _pipeline('{"is_relevant": "yes", "jobTitle": "Engineer", "company": "Acme"}')
+    fields = pipeline._stream_extraction([], 'https://example.com')
+    assert fields['jobTitle'] == 'Engineer'
+    assert pipeline.progress[0] == {'is_relevant': 'yes', 'jobTitle': 'Engineer', 'url': 'https://example.com'}
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+
+import pytest
+
+from settings import load_settings
+
+@pytest.fixture
+def settings_file(tmp_path, monkeypatch):
+    for name in list(os.environ):
+        if name.startswith('LEADZ_'):
+            monkeypatch.delenv(name)
+    path = tmp_path / 'settings.json'
+    path.write_text(json.dumps({'fetch_concurrency': 8.0, 'search_results_count': 7.5,
+                                'fetch_timeout': 3.5, 'stream_extraction': 'no'}))
+    return path
+
+def test_settings_file_values_are_coerced(settings_file):
+    settings = load_settings([], path=settings_file)
+    assert settings.fetch_concurrency == 8 and isinstance(settings.fetch_concurrency, int)
+    assert settings.search_results_count == 25 # 7.5 is ignored
+    assert settings.fetch_timeout == 3.5
+    assert settings.stream_extraction is False
+
+def test_count_settings_must_be_whole_numbers(settings_file, monkeypatch):
+    monkeypatch.setenv('LEADZ_TOP_N_PAGES_TO_ANALYZE', '4.0')
+    settings = load_settings(['--max-search-attempts', '2.5', '--search-deadline', '12.5'], path=settings_file)
+    assert settings.top_n_pages_to_analyze == 4 and isinstance(settings.top_n_pages_to_analyze, int)
+    assert settings.max_search_attempts == 2
+    assert settings.search_deadline == 12.5
+
+def test_reject_threshold_follows_similarity_threshold(settings_file):
+    settings = load_settings(['--similarity-threshold', '0.1'], path=settings_file)
+    assert settings.classifier_reject_below is None
+    assert settings.similarity_threshold == 0.1
@@ -1,14 +1,14 @@
 # -*- coding: utf-8 -*-
 import json
-from pathlib import Path
 
 from PySide6.QtGui import QPalette, QColor
 
-from config import THEMES
+from config import CONFIG_DIR, THEMES
+from settings import read_settings_file
 
 class ThemeManager:
     def __init__(self):
-        self.config_dir = Path.home() / '.job_llama'
+        self.config_dir = CONFIG_DIR
         try:
             self.config_dir.mkdir(exist_ok=True)
         except Exception as e:
@@ -17,25 +17,20 @@ class ThemeManager:
         self.theme = self._load_theme()
 
     def _load_theme(self):
-        if not self.settings_file.exists():
-            return 'dark'
-        try:
-            with open(self.settings_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('theme', 'dark')
-        except Exception as e:
-            print(f"Settings file error: {e}")
-            try:
-                self.settings_file.unlink()
-            except:
-                pass
-            return 'dark'
+        return read_settings_file(self.settings_file).get('theme', 'dark')
 
     def save_theme(self, theme_name):
         self.theme = theme_name
+        try:
+            # settings.json also holds runtime settings (see settings.py).
+            data = read_settings_file(self.settings_file, strict=True)
+        except Exception as e:
+            print(f"Not saving theme, fix {self.settings_file} first: {e}")
+            return
+        data['theme'] = theme_name
         try:
             with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump({'theme': theme_name}, f, indent=2)
+                json.dump(data, f, indent=2)
         except Exception as e:
             print(f"Failed to save settings: {e}")
 
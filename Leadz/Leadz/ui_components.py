@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtCore import Qt, QSize, Signal
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                               QLabel, QFrame, QTextEdit, QSizePolicy)
+                               QLabel, QFrame, QTextEdit, QSizePolicy, QScrollArea,
+                               QLineEdit, QComboBox)
 from PySide6.QtGui import QFont, QPalette, QPixmap, QPainter, QIcon, QColor, QPen
 
+from job_index import JobIndex, parse_salary_amount
+from job_record import Experience, JobType
+from job_schema import MISSING
+
 class CustomTitleBar(QWidget):
     def __init__(self, parent):
         super().__init__(parent)
@@ -121,10 +126,10 @@ class CustomTitleBar(QWidget):
         self.toggle_maximize()
 
 class JobCard(QFrame):
-    def __init__(self, job_data, theme_manager):
+    def __init__(self, job, theme_manager):
         super().__init__()
         self.theme_manager = theme_manager
-        self.job_data = job_data
+        self.job = job
         self.setFrameShape(QFrame.StyledPanel)
         self.setLineWidth(1)
         
@@ -136,7 +141,7 @@ class JobCard(QFrame):
         title_font = QFont()
         title_font.setPointSize(12)
         title_font.setWeight(QFont.Bold)
-        self.title_label = QLabel(self.job_data.get("jobTitle", "No Title"))
+        self.title_label = QLabel(job.title if job.title != MISSING else "No Title")
         self.title_label.setFont(title_font)
         self.title_label.setWordWrap(True)
         layout.addWidget(self.title_label)
@@ -144,30 +149,19 @@ class JobCard(QFrame):
         # --- Company & Location ---
         company_font = QFont()
         company_font.setPointSize(9)
-        company_location = "{} - {}".format(self.job_data.get('company', 'N/A'), self.job_data.get('location', 'N/A'))
+        company_location = "{} - {}".format(job.company, job.location)
         self.company_label = QLabel(company_location)
         self.company_label.setFont(company_font)
         layout.addWidget(self.company_label)
 
         # --- Details Line (Type, Experience, Salary) ---
         details_parts = []
-        
-        def process_detail(detail_value):
-            if isinstance(detail_value, list):
-                return ", ".join(map(str, detail_value))
-            return str(detail_value)
-
-        job_type_raw = self.job_data.get("job_type", "N/A")
-        if job_type_raw and job_type_raw != "N/A":
-            details_parts.append(process_detail(job_type_raw))
-        
-        experience_raw = self.job_data.get("experience", "N/A")
-        if experience_raw and experience_raw != "N/A":
-            details_parts.append(process_detail(experience_raw))
-            
-        salary_raw = self.job_data.get("salary", "N/A")
-        if salary_raw and salary_raw != "N/A":
-            details_parts.append(f"Salary: {process_detail(salary_raw)}")
+        if job.job_type is not JobType.UNKNOWN:
+            details_parts.append(job.job_type.value)
+        if job.experience is not Experience.UNKNOWN:
+            details_parts.append(job.experience.value)
+        if job.salary and job.salary != MISSING:
+            details_parts.append(f"Salary: {job.salary}")
 
         if details_parts:
             details_font = QFont()
@@ -179,18 +173,16 @@ class JobCard(QFrame):
             layout.addWidget(self.details_label)
 
         # --- Skills ---
-        skills = self.job_data.get("skills", [])
-        if skills:
-            skills_text = ", ".join(skills) if isinstance(skills, list) else str(skills)
+        if job.skills:
             skills_font = QFont()
             skills_font.setPointSize(9)
-            self.skills_label = QLabel(f"<b>Skills:</b> {skills_text}")
+            self.skills_label = QLabel(f"<b>Skills:</b> {', '.join(job.skills)}")
             self.skills_label.setFont(skills_font)
             self.skills_label.setWordWrap(True)
             layout.addWidget(self.skills_label)
         
         # --- Summary ---
-        summary_text = self.job_data.get("summary", "No summary available.")
+        summary_text = job.summary if job.summary != MISSING else "No summary available."
         self.summary_edit = QTextEdit(summary_text)
         self.summary_edit.setReadOnly(True)
         self.summary_edit.setTextInteractionFlags(Qt.TextSelectableByMouse)
@@ -206,7 +198,7 @@ class JobCard(QFrame):
         bottom_layout.setContentsMargins(0, 5, 0, 0)
         bottom_layout.addStretch()
 
-        url = self.job_data.get("url", "#")
+        url = job.url or "#"
         self.link_label = QLabel('<a href="{}">View Full Listing</a>'.format(url))
         self.link_label.setOpenExternalLinks(True)
         self.link_label.setAlignment(Qt.AlignRight)
@@ -248,4 +240,179 @@ class JobCard(QFrame):
         self.link_label.setStyleSheet("color: {link}; background-color: transparent; border: none;".format(link=theme['link']))
 
     def refresh_theme(self):
-        self._apply_theme()
\ No newline at end of file
+        self._apply_theme()
+
+class FilterBar(QWidget):
+    changed = Signal()
+
+    SORT_OPTIONS = (("Best match", 'relevance'), ("Highest salary", 'salary'), ("Title", 'title'),
+                    ("Company", 'company'), ("Newest", 'newest'))
+
+    def __init__(self, theme_manager):
+        super().__init__()
+        self.theme_manager = theme_manager
+        self.setObjectName("filter_bar")
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(25, 10, 25, 0)
+        layout.setSpacing(8)
+
+        self.skill_input = self._line_edit("Skills, e.g. python, sql", layout, 2)
+        self.company_input = self._line_edit("Company", layout, 1)
+        self.location_input = self._line_edit("Location", layout, 1)
+        self.salary_input = self._line_edit("Min salary/yr", layout, 1)
+
+        self.job_type_combo = QComboBox()
+        self.job_type_combo.addItem("Any type", None)
+        for job_type in JobType:
+            if job_type is not JobType.UNKNOWN:
+                self.job_type_combo.addItem(job_type.value, job_type)
+        self.experience_combo = QComboBox()
+        self.experience_combo.addItem("Any level", None)
+        for experience in Experience:
+            if experience is not Experience.UNKNOWN:
+                self.experience_combo.addItem(experience.value, experience)
+        self.sort_combo = QComboBox()
+        for label, key in self.SORT_OPTIONS:
+            self.sort_combo.addItem(label, key)
+        for combo in (self.job_type_combo, self.experience_combo, self.sort_combo):
+            combo.currentIndexChanged.connect(self.changed)
+            layout.addWidget(combo)
+
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+        self._apply_theme()
+
+    def _line_edit(self, placeholder, layout, stretch):
+        line_edit = QLineEdit()
+        line_edit.setPlaceholderText(placeholder)
+        line_edit.textChanged.connect(self.changed)
+        layout.addWidget(line_edit, stretch)
+        return line_edit
+
+    def criteria(self):
+        return {
+            'skill': self.skill_input.text(),
+            'company': self.company_input.text(),
+            'location': self.location_input.text(),
+            'job_type': self.job_type_combo.currentData(),
+            'experience': self.experience_combo.currentData(),
+            'min_salary': parse_salary_amount(self.salary_input.text()),
+            'sort': self.sort_combo.currentData(),
+        }
+
+    def set_counts(self, shown, total):
+        self.count_label.setText(f"{shown} of {total}" if shown != total else f"{total} jobs")
+
+    def _apply_theme(self):
+        theme = self.theme_manager.get_current_theme()
+        self.count_label.setStyleSheet("color: {secondary}; font-size: 9pt;".format(secondary=theme['text_secondary']))
+
+    def refresh_theme(self):
+        self._apply_theme()
+
+class SearchTab(QWidget):
+    # Jobs live in a JobIndex; cards are only built for the current page of
+    # filtered results, so the widget work per filter change is bounded by
+    # RESULTS_PAGE_SIZE however many jobs the tab holds.
+    RESULTS_PAGE_SIZE = 25
+
+    def __init__(self, job_id, query, theme_manager):
+        super().__init__()
+        self.job_id = job_id
+        self.query = query
+        self.theme_manager = theme_manager
+        self.status_text = "Queued..."
+        self.is_finished = False
+
+        self.index = JobIndex()
+        self.cards = {}
+        self._displayed = []
+        self._limit = self.RESULTS_PAGE_SIZE
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        # Hidden until the first job arrives.
+        self.filter_bar = FilterBar(theme_manager)
+        self.filter_bar.changed.connect(self.filter_changed)
+        self.filter_bar.hide()
+        layout.addWidget(self.filter_bar)
+
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setFrameShape(QFrame.NoFrame)
+        self.scroll_area.setLineWidth(0)
+        
+        self.results_container = QWidget()
+        self.results_layout = QVBoxLayout(self.results_container)
+        self.results_layout.setContentsMargins(25, 20, 25, 20)
+        self.results_layout.setSpacing(15)
+        self.results_layout.setAlignment(Qt.AlignTop)
+
+        self.more_button = QPushButton()
+        self.more_button.clicked.connect(self.show_more)
+        self.more_button.hide()
+        self.results_layout.addWidget(self.more_button)
+        
+        self.scroll_area.setWidget(self.results_container)
+        layout.addWidget(self.scroll_area)
+
+    def add_job_card(self, job):
+        self.add_jobs([job])
+
+    def add_jobs(self, jobs):
+        for job in jobs:
+            self.index.add(job)
+        self.filter_bar.show()
+        self.apply_filter()
+
+    def filter_changed(self):
+        self._limit = self.RESULTS_PAGE_SIZE
+        self.apply_filter()
+
+    def show_more(self):
+        self._limit += self.RESULTS_PAGE_SIZE
+        self.apply_filter()
+
+    def apply_filter(self):
+        shown = self.index.query(**self.filter_bar.criteria())
+        self.results_container.setUpdatesEnabled(False)
+        self._display(shown[:self._limit])
+        self.results_container.setUpdatesEnabled(True)
+        remaining = len(shown) - len(self._displayed)
+        self.more_button.setVisible(remaining > 0)
+        self.more_button.setText(f"Show more ({remaining} remaining)")
+        self.filter_bar.set_counts(len(shown), len(self.index))
+
+    def _display(self, page):
+        # Moves only the cards that are out of place, so a new job arriving
+        # costs at most one layout insertion.
+        wanted = set(page)
+        for i in self._displayed:
+            if i not in wanted:
+                self.results_layout.removeWidget(self.cards[i])
+                self.cards[i].hide()
+        current = [i for i in self._displayed if i in wanted]
+        for position, i in enumerate(page):
+            if position < len(current) and current[position] == i:
+                continue
+            if i in current:
+                current.remove(i)
+            current.insert(position, i)
+            card = self.cards.get(i)
+            if card is None:
+                card = self.cards[i] = JobCard(self.index.jobs[i], self.theme_manager)
+            self.results_layout.removeWidget(card)
+            self.results_layout.insertWidget(position, card)
+            card.show()
+        self._displayed = current
+
+    def job_count(self):
+        return len(self.index)
+
+    def refresh_theme(self):
+        self.filter_bar.refresh_theme()
+        for card in self.cards.values():
+            card.refresh_theme()